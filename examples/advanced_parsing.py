@@ -1,15 +1,41 @@
 import sys
 import os
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 
 # Add the src directory to the path so we can import the modules
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from src.core.excel_processor import ExcelProcessor
 from src.core.type_detector import DataTypeDetector
 from src.core.format_parser import FormatParser
+from src.utils.helpers import infer_schema, load_cached_schema, save_cached_schema, is_output_current
+
+# PNG encoding runs on background threads so it overlaps with parsing the next sheet
+_PLOT_POOL = ThreadPoolExecutor(max_workers=2)
+
+def _sample_non_null(series, k=5, probe=64):
+    """Return the first k non-null values of a Series, scanning only a prefix when possible."""
+    values = series.iloc[:max(probe, k)].dropna()
+    if len(values) < k and len(series) > max(probe, k):
+        # Too many nulls in the prefix, fall back to the whole column
+        values = series.dropna()
+    return values.head(k).tolist()
+
+def _box_stats(label, values):
+    """Compute box plot statistics (1.5 IQR whiskers) for Axes.bxp."""
+    values = np.asarray(values, dtype='float64')
+    q1, med, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        'label': label, 'q1': q1, 'med': med, 'q3': q3,
+        'whislo': inside.min(), 'whishi': inside.max(),
+        'fliers': values[(values < inside.min()) | (values > inside.max())]
+    }
 
 def main():
     # Initialize the components
@@ -17,10 +43,14 @@ def main():
     type_detector = DataTypeDetector()
     format_parser = FormatParser()
     
+    # Bound once for the column loop below
+    currency_search = format_parser.currency_pattern.search
+    
     # Load the sample Excel files
     data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'sample')
     kh_bank_path = os.path.join(data_dir, 'KH_Bank.XLSX')
     customer_ledger_path = os.path.join(data_dir, 'Customer_Ledger_Entries_FULL.xlsx')
+    schema_cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'output', '.schema_cache')
     
     # Load the files
     excel_processor.load_file(kh_bank_path)
@@ -43,8 +73,12 @@ def main():
                 print("    No data found in this sheet.")
                 continue
             
-            # Analyze the DataFrame to detect column types
-            type_results = type_detector.analyze_dataframe(df)
+            # Analyze the DataFrame to detect column types, reusing the cached
+            # result if the file has not changed since the last run
+            type_results = load_cached_schema(file_path, sheet_name, schema_cache_dir)
+            if type_results is None:
+                type_results = infer_schema(type_detector, df)
+                save_cached_schema(file_path, sheet_name, schema_cache_dir, type_results)
             
             # Process a sample of each column based on its detected type
             print("    Column Format Parsing:")
@@ -54,7 +88,7 @@ def main():
                     continue
                 
                 # Get a sample of non-null values from the column
-                sample_values = df[column].dropna().head(5).tolist()
+                sample_values = _sample_non_null(df[column], 5)
                 if not sample_values:
                     continue
                 
@@ -67,11 +101,11 @@ def main():
                     print(f"      Parsed Number Values: {parsed_values}")
                     
                     # If it looks like currency, try to normalize it
-                    if any(isinstance(v, str) and any(sym in v for sym in format_parser.currency_symbols) for v in sample_values):
-                        normalized = [format_parser.normalize_currency(v) for v in sample_values]
+                    if any(currency_search(str(value)) for value in sample_values):
+                        normalized = format_parser.normalize_currency_series(pd.Series(sample_values))
                         print(f"      Normalized Currency Values:")
-                        for i, n in enumerate(normalized):
-                            print(f"        {sample_values[i]} -> {n['value']} {n['currency']}")
+                        for original, value, currency in zip(sample_values, normalized['value'], normalized['currency']):
+                            print(f"        {original} -> {value} {currency}")
                 
                 elif type_result['type'] == 'date':
                     parsed_values = format_parser.batch_parse_dates(sample_values, type_result['format'])
@@ -84,10 +118,21 @@ def main():
                         print(f"      Standardized Values: {parsed_values}")
             
             # Create a visualization of the parsing results
-            visualize_parsing_results(file_name, sheet_name, df, type_results, format_parser)
+            visualize_parsing_results(file_name, sheet_name, df, type_results, format_parser, file_path)
+    
+    # Wait for the charts still being written
+    _PLOT_POOL.shutdown(wait=True)
 
-def visualize_parsing_results(file_name, sheet_name, df, type_results, format_parser):
-    """Create a visualization of the format parsing results."""
+def visualize_parsing_results(file_name, sheet_name, df, type_results, format_parser, source_path=None):
+    """Create a visualization of the format parsing results.
+    
+    If source_path is given and the saved chart is newer than it, the chart is left as is.
+    """
+    output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'output')
+    output_path = os.path.join(output_dir, f'{file_name}_{sheet_name}_format_parsing.png')
+    if source_path is not None and is_output_current(output_path, source_path):
+        return  # Chart is up to date
+    
     # Filter to only include numeric columns
     numeric_columns = [col for col, result in type_results.items() 
                       if result['type'] == 'number' and col in df.columns]
@@ -102,7 +147,7 @@ def visualize_parsing_results(file_name, sheet_name, df, type_results, format_pa
     if numeric_columns:
         col = numeric_columns[0]
         # Get original values
-        original_values = df[col].dropna().head(10).tolist()
+        original_values = _sample_non_null(df[col], 10)
         # Parse values
         parsed_values = [format_parser.parse_amount(val) for val in original_values]
         
@@ -121,7 +166,7 @@ def visualize_parsing_results(file_name, sheet_name, df, type_results, format_pa
     # 2. Distribution of parsed values across all numeric columns
     parsed_data = {}
     for col in numeric_columns[:5]:  # Limit to first 5 numeric columns
-        values = df[col].dropna().head(50).tolist()
+        values = _sample_non_null(df[col], 50)
         parsed = [format_parser.parse_amount(val) for val in values]
         # Filter out None values
         parsed = [p for p in parsed if p is not None]
@@ -130,18 +175,20 @@ def visualize_parsing_results(file_name, sheet_name, df, type_results, format_pa
     
     # Create box plot
     if parsed_data:
-        sns.boxplot(data=pd.DataFrame(parsed_data), ax=ax2)
+        ax2.bxp([_box_stats(col, parsed) for col, parsed in parsed_data.items()])
         ax2.set_title('Distribution of Parsed Numeric Values')
         ax2.set_ylabel('Value')
-        ax2.set_xticklabels(ax2.get_xticklabels(), rotation=45)
+        ax2.tick_params(axis='x', labelrotation=45)
     
     plt.tight_layout()
     
     # Save the figure
-    output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'output')
     os.makedirs(output_dir, exist_ok=True)
-    plt.savefig(os.path.join(output_dir, f'{file_name}_{sheet_name}_format_parsing.png'))
-    plt.close()
+    # Rasterize now and leave the PNG encoding to a background thread
+    fig.canvas.draw()
+    rgba = np.array(fig.canvas.buffer_rgba())
+    plt.close(fig)
+    _PLOT_POOL.submit(plt.imsave, output_path, rgba)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -13,8 +13,15 @@ This script demonstrates the complete workflow of the Financial Data Parser:
 
 import os
 import sys
+from importlib.util import find_spec
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.image as mpimg
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -25,22 +32,168 @@ from src.core.excel_processor import ExcelProcessor
 from src.core.type_detector import DataTypeDetector
 from src.core.format_parser import FormatParser
 from src.core.data_storage import DataStorage
+from src.utils.helpers import (
+    infer_schema, load_cached_schema, save_cached_schema,
+    categorize_string_columns, is_output_current, find_excel_files
+)
 
 # Set up paths
 BASE_DIR = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 DATA_DIR = BASE_DIR / 'data' / 'sample'
 OUTPUT_DIR = BASE_DIR / 'output'
+SCHEMA_CACHE_DIR = OUTPUT_DIR / '.schema_cache'
+
+# Keep sheet columns Arrow-backed when pyarrow is available
+DTYPE_BACKEND = 'pyarrow' if find_spec('pyarrow') else None
 
 # Ensure output directory exists
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# A single Agg figure reused for every chart in this process, bypassing pyplot's
+# global figure manager
+_FIG = Figure(figsize=(12, 6))
+_CANVAS = FigureCanvasAgg(_FIG)
+_AX = _FIG.add_subplot(111)
+
+def _reset_figure(figsize):
+    """
+    Clear the shared figure for a new chart and return its axes.
+    """
+    _FIG.set_size_inches(*figsize)
+    _AX.clear()
+    return _AX
+
+# PNG encoding runs on background threads so it overlaps with parsing
+_PLOT_POOL = ThreadPoolExecutor(max_workers=2)
+
+def _save_figure(path):
+    """
+    Render the shared figure and write it to path in the background.
+    
+    The figure is rasterized immediately, so it can be reused for the next
+    chart while the PNG is encoded. Returns the Future of the write.
+    """
+    _CANVAS.draw()
+    rgba = np.array(_CANVAS.buffer_rgba())
+    return _PLOT_POOL.submit(mpimg.imsave, str(path), rgba)
+
+def _process_sheet(file_path, sheet_name):
+    """
+    Extract, type-detect, parse and plot a single sheet.
+    
+    Runs in a worker process, so it creates its own components and returns
+    its console output instead of printing it.
+    
+    Returns:
+        tuple: (dataset_name, parsed_data, column_types, log); parsed_data is
+        None if the sheet is empty
+    """
+    excel_processor = ExcelProcessor()
+    type_detector = DataTypeDetector()
+    format_parser = FormatParser()
+    log = [f"\n--- Processing sheet: {sheet_name} ({file_path.name}) ---"]
+    pending_charts = []
+    
+    # Create a unique dataset name
+    dataset_name = f"{file_path.stem}_{sheet_name}"
+    
+    # Extract data from the sheet
+    excel_processor.load_file(str(file_path))
+    df = excel_processor.extract_data(sheet_name, dtype_backend=DTYPE_BACKEND)
+    excel_processor.close()  # drop the workbook and the cached copy of the sheet
+    if df.empty:
+        log.append(f"  Sheet {sheet_name} is empty or could not be processed")
+        return dataset_name, None, None, log
+    
+    # Phase 2: Data Type Detection
+    log.append("\nDetecting column data types...")
+    column_types = load_cached_schema(file_path, sheet_name, SCHEMA_CACHE_DIR)
+    if column_types is None:
+        column_types = infer_schema(type_detector, df)
+        save_cached_schema(file_path, sheet_name, SCHEMA_CACHE_DIR, column_types)
+    else:
+        log.append("  (using cached column types)")
+    
+    # Display detected types for a few columns
+    sample_columns = list(column_types.keys())[:5]  # Show first 5 columns
+    for column in sample_columns:
+        result = column_types[column]
+        log.append(f"  - {column}: {result['type']} (confidence: {result['confidence']:.2f}, format: {result['format']})")
+    
+    # Visualize type detection results
+    # Create a simple visualization of the detected types (skipped if the
+    # saved chart is newer than the workbook)
+    type_chart_path = OUTPUT_DIR / f"{file_path.name}_{sheet_name}_type_detection.png"
+    if not is_output_current(type_chart_path, file_path):
+        ax = _reset_figure((12, 6))
+        
+        # Count types
+        type_counts = {}
+        for col, result in column_types.items():
+            col_type = result['type']
+            if col_type not in type_counts:
+                type_counts[col_type] = 0
+            type_counts[col_type] += 1
+        
+        # Plot
+        ax.bar(type_counts.keys(), type_counts.values())
+        ax.set_title(f"Data Types in {sheet_name}")
+        ax.set_xlabel("Data Type")
+        ax.set_ylabel("Count")
+        pending_charts.append(_save_figure(type_chart_path))
+    
+    # Phase 3: Format Parsing
+    log.append("\nParsing formats...")
+    parsed_columns = {}
+    
+    # Parse dates and amounts based on detected types
+    for column, result in column_types.items():
+        if result['type'] == 'date' and column in df.columns:
+            # Parse dates for the whole column at once, using the detected format
+            parsed_columns[f"{column}_parsed"] = format_parser.parse_date_series(df[column], result['format'])
+            log.append(f"  - Parsed dates in column: {column}")
+        
+        elif result['type'] == 'number' and column in df.columns:
+            # Parse amounts for the whole column at once
+            parsed_columns[f"{column}_parsed"] = format_parser.parse_amount_series(df[column])
+            log.append(f"  - Parsed amounts in column: {column}")
+    
+    # Add the parsed columns in one step instead of copying the sheet up front
+    parsed_data = pd.concat([df, pd.DataFrame(parsed_columns, index=df.index)], axis=1, copy=False)
+    
+    # Store repeated string values (accounts, currencies, ...) as categoricals
+    parsed_data = categorize_string_columns(parsed_data, column_types)
+    
+    # Visualize format parsing results for a sample column
+    # Create a simple visualization of the parsed formats
+    parsing_chart_path = OUTPUT_DIR / f"{file_path.name}_{sheet_name}_format_parsing.png"
+    if not is_output_current(parsing_chart_path, file_path):
+        ax = _reset_figure((12, 6))
+        
+        # Count parsed columns by type
+        parsed_counts = {'date': 0, 'number': 0}
+        for column, result in column_types.items():
+            if result['type'] in ['date', 'number'] and column in df.columns:
+                parsed_counts[result['type']] += 1
+        
+        # Plot
+        ax.bar(parsed_counts.keys(), parsed_counts.values())
+        ax.set_title(f"Parsed Formats in {sheet_name}")
+        ax.set_xlabel("Data Type")
+        ax.set_ylabel("Count of Parsed Columns")
+        pending_charts.append(_save_figure(parsing_chart_path))
+    
+    # Make sure the charts are written before this worker hands back the sheet
+    for chart in pending_charts:
+        chart.result()
+    
+    return dataset_name, parsed_data, column_types, log
+
 def main():
     print("\n=== Financial Data Parser: Complete Workflow Example ===")
     
     # Initialize components
     excel_processor = ExcelProcessor()
-    type_detector = DataTypeDetector()
-    format_parser = FormatParser()
     
     # Initialize different storage types
     memory_storage = DataStorage(storage_type="memory")
@@ -49,204 +202,163 @@ def main():
     
     # Track processed files to avoid duplicates
     processed_files = set()
+    sheets_to_process = []
     
-    # Process each Excel file in the data directory
-    for file_path in DATA_DIR.glob("*.xls*"):
+    # Phase 1: Excel Processing - list the sheets of each Excel file in the data directory
+    for file_path in find_excel_files(DATA_DIR):
         if str(file_path) in processed_files:
             continue
         processed_files.add(str(file_path))
         
         print(f"\n=== Processing {file_path.name} ===")
         
-        # Phase 1: Excel Processing
         try:
-            excel_processor.load_file(str(file_path))
-            sheet_info = excel_processor.get_sheet_info()
+            if not excel_processor.load_file(str(file_path)):
+                continue
             
-            print(f"File contains {len(sheet_info)} sheets:")
-            for sheet_name, info in sheet_info.items():
-                print(f"  - {sheet_name}: {info['rows']} rows, {info['columns']} columns")
+            # The sheets are only listed here, not extracted: each worker reads its
+            # own sheet, and the size comes from the worksheet's recorded dimensions
+            sheet_names = excel_processor.dataframes[str(file_path)].sheet_names
+            workbook = excel_processor.workbooks[str(file_path)]
             
-            # Process each sheet in the file
-            for sheet_name, info in sheet_info.items():
-                print(f"\n--- Processing sheet: {sheet_name} ---")
-                
-                # Extract data from the sheet
-                df = excel_processor.extract_data(sheet_name)
-                if df.empty:
-                    print(f"  Sheet {sheet_name} is empty or could not be processed")
-                    continue
-                
-                # Create a unique dataset name
-                dataset_name = f"{file_path.stem}_{sheet_name}"
-                
-                # Phase 2: Data Type Detection
-                print("\nDetecting column data types...")
-                column_types = type_detector.analyze_dataframe(df)
-                
-                # Display detected types for a few columns
-                sample_columns = list(column_types.keys())[:5]  # Show first 5 columns
-                for column in sample_columns:
-                    result = column_types[column]
-                    print(f"  - {column}: {result['type']} (confidence: {result['confidence']:.2f}, format: {result['format']})")
-                
-                # Visualize type detection results
-                # Create a simple visualization of the detected types
-                plt.figure(figsize=(12, 6))
-                
-                # Count types
-                type_counts = {}
-                for col, result in column_types.items():
-                    col_type = result['type']
-                    if col_type not in type_counts:
-                        type_counts[col_type] = 0
-                    type_counts[col_type] += 1
-                
-                # Plot
-                plt.bar(type_counts.keys(), type_counts.values())
-                plt.title(f"Data Types in {sheet_name}")
-                plt.xlabel("Data Type")
-                plt.ylabel("Count")
-                plt.savefig(str(OUTPUT_DIR / f"{file_path.name}_{sheet_name}_type_detection.png"))
-                plt.close()
-                
-                # Phase 3: Format Parsing
-                print("\nParsing formats...")
-                parsed_data = df.copy()
-                
-                # Parse dates and amounts based on detected types
-                for column, result in column_types.items():
-                    if result['type'] == 'date' and column in df.columns:
-                        # Parse dates
-                        parsed_data[f"{column}_parsed"] = df[column].apply(
-                            lambda x: format_parser.parse_date(str(x)) if pd.notna(x) else None
-                        )
-                        print(f"  - Parsed dates in column: {column}")
-                    
-                    elif result['type'] == 'number' and column in df.columns:
-                        # Parse amounts
-                        parsed_data[f"{column}_parsed"] = df[column].apply(
-                            lambda x: format_parser.parse_amount(str(x)) if pd.notna(x) else None
-                        )
-                        print(f"  - Parsed amounts in column: {column}")
-                
-                # Visualize format parsing results for a sample column
-                # Create a simple visualization of the parsed formats
-                plt.figure(figsize=(12, 6))
-                
-                # Count parsed columns by type
-                parsed_counts = {'date': 0, 'number': 0}
-                for column, result in column_types.items():
-                    if result['type'] in ['date', 'number'] and column in df.columns:
-                        parsed_counts[result['type']] += 1
-                
-                # Plot
-                plt.bar(parsed_counts.keys(), parsed_counts.values())
-                plt.title(f"Parsed Formats in {sheet_name}")
-                plt.xlabel("Data Type")
-                plt.ylabel("Count of Parsed Columns")
-                plt.savefig(str(OUTPUT_DIR / f"{file_path.name}_{sheet_name}_format_parsing.png"))
-                plt.close()
-                
-                # Phase 4: Data Storage
-                print("\nStoring data...")
-                
-                # Store in different storage types
-                memory_storage.store_data(dataset_name, parsed_data, column_types)
-                file_storage.store_data(dataset_name, parsed_data, column_types)
-                sqlite_storage.store_data(dataset_name, parsed_data, column_types)
-                
-                print("  - Stored in memory storage")
-                print("  - Stored in file storage")
-                print("  - Stored in SQLite storage")
-                
-                # Create indexes for faster querying
-                # Find numeric and date columns to index
-                numeric_columns = [col for col, res in column_types.items() 
-                                 if res['type'] == 'number' and col in df.columns][:2]  # Index first 2 numeric columns
-                date_columns = [col for col, res in column_types.items() 
-                              if res['type'] == 'date' and col in df.columns][:1]  # Index first date column
-                
-                # Create indexes
-                columns_to_index = numeric_columns + date_columns
-                if columns_to_index:
-                    memory_storage.create_indexes(dataset_name, columns_to_index)
-                    sqlite_storage.create_indexes(dataset_name, columns_to_index)
-                    print("  - Created indexes for faster querying")
-                
-                # Demonstrate querying and aggregation
-                if len(numeric_columns) > 0 and len(df) > 10:
-                    print(f"\n=== Query Examples for {dataset_name} ===")
-                    
-                    # Example 1: Simple numeric filter
-                    numeric_col = numeric_columns[0]
-                    threshold = df[numeric_col].median()  # Use median as threshold
-                    
-                    results = memory_storage.query_data(
-                        dataset_name,
-                        filters={numeric_col: {"gt": threshold}}
-                    )
-                    print(f"  - Records with {numeric_col} > {threshold}: {len(results)}")
-                    
-                    # Example 2: String equality filter if string columns exist
-                    string_columns = [col for col, res in column_types.items() 
-                                    if res['type'] == 'string' and col in df.columns]
-                    
-                    if string_columns:
-                        string_col = string_columns[0]
-                        # Find a common value in the string column
-                        common_values = df[string_col].value_counts().head(1).index.tolist()
-                        
-                        if common_values:
-                            common_value = common_values[0]
-                            results = memory_storage.query_data(
-                                dataset_name,
-                                filters={string_col: common_value}
-                            )
-                            print(f"  - Records with {string_col} = '{common_value}': {len(results)}")
-                            
-                            # Example 3: Combined filter
-                            results = memory_storage.query_data(
-                                dataset_name,
-                                filters={
-                                    numeric_col: {"gt": threshold},
-                                    string_col: common_value
-                                }
-                            )
-                            print(f"  - Records with {numeric_col} > {threshold} AND {string_col} = '{common_value}': {len(results)}")
-                    
-                    # Example 4: Aggregation
-                    print(f"\n=== Aggregation Examples for {dataset_name} ===")
-                    
-                    # Group by a string column if available, otherwise use first column
-                    group_by_col = string_columns[0] if string_columns else df.columns[0]
-                    
-                    aggregated = memory_storage.aggregate_data(
-                        dataset_name,
-                        group_by=[group_by_col],
-                        measures={numeric_col: ["sum"]}
-                    )
-                    
-                    print(f"  - Aggregation by {group_by_col}, sum of {numeric_col}:")
-                    print(aggregated)
-                    
-                    # Visualize aggregation results
-                    plt.figure(figsize=(10, 6))
-                    aggregated.plot(kind='bar', x=group_by_col, y=f"{numeric_col}_sum")
-                    plt.title(f"Sum of {numeric_col} by {group_by_col}")
-                    plt.tight_layout()
-                    plt.savefig(str(OUTPUT_DIR / f"{dataset_name}_aggregation.png"))
-                    plt.close()
-                    
-                    print(f"  - Visualization saved to {dataset_name}_aggregation.png")
-        
+            print(f"File contains {len(sheet_names)} sheets:")
+            for sheet_name in sheet_names:
+                worksheet = workbook[sheet_name]
+                if worksheet.max_row is None:
+                    print(f"  - {sheet_name}: size not recorded")
+                else:
+                    print(f"  - {sheet_name}: {worksheet.max_row} rows, {worksheet.max_column} columns (worksheet size)")
+                sheets_to_process.append((file_path, sheet_name))
         except Exception as e:
             print(f"Error processing {file_path.name}: {str(e)}")
     
+    # Release the workbooks before the workers start
+    excel_processor.close()
+    
+    if not sheets_to_process:
+        sqlite_storage.close()
+        return
+    
+    # Phases 2-3 run in parallel, one sheet per worker process. Storage stays in
+    # this process since the SQLite connection cannot be shared with workers.
+    with ProcessPoolExecutor(max_workers=min(len(sheets_to_process), os.cpu_count() or 1)) as executor:
+        futures = {
+            executor.submit(_process_sheet, file_path, sheet_name): (file_path, sheet_name)
+            for file_path, sheet_name in sheets_to_process
+        }
+        
+        for future in as_completed(futures):
+            file_path, sheet_name = futures[future]
+            try:
+                dataset_name, parsed_data, column_types, log = future.result()
+                print("\n".join(log))
+                if parsed_data is None:
+                    continue
+                
+                _store_and_query(dataset_name, parsed_data, column_types,
+                                 memory_storage, file_storage, sqlite_storage)
+            except Exception as e:
+                print(f"Error processing {file_path.name} ({sheet_name}): {str(e)}")
+    
     # Clean up resources
     sqlite_storage.close()
     
     print("\n=== Complete Workflow Processing Complete ===")
 
+def _store_and_query(dataset_name, df, column_types, memory_storage, file_storage, sqlite_storage):
+    """
+    Store a parsed sheet, index it and run the query and aggregation examples.
+    """
+    print("\nStoring data...")
+    
+    # Store in all storage types in a single pass
+    DataStorage.store_data_multi(
+        [memory_storage, file_storage, sqlite_storage],
+        dataset_name, df, column_types
+    )
+    
+    print("  - Stored in memory storage")
+    print("  - Stored in file storage")
+    print("  - Stored in SQLite storage")
+    
+    # Create indexes for faster querying
+    # Find numeric and date columns to index
+    numeric_columns = [col for col, res in column_types.items() 
+                     if res['type'] == 'number' and col in df.columns][:2]  # Index first 2 numeric columns
+    date_columns = [col for col, res in column_types.items() 
+                  if res['type'] == 'date' and col in df.columns][:1]  # Index first date column
+    
+    # Create indexes
+    columns_to_index = numeric_columns + date_columns
+    if columns_to_index:
+        memory_storage.create_indexes(dataset_name, columns_to_index)
+        sqlite_storage.create_indexes(dataset_name, columns_to_index)
+        print("  - Created indexes for faster querying")
+    
+    # Demonstrate querying and aggregation
+    if len(numeric_columns) > 0 and len(df) > 10:
+        print(f"\n=== Query Examples for {dataset_name} ===")
+        
+        # Example 1: Simple numeric filter
+        numeric_col = numeric_columns[0]
+        threshold = df[numeric_col].median()  # Use median as threshold
+        
+        results = memory_storage.query_data(
+            dataset_name,
+            filters={numeric_col: {"gt": threshold}}
+        )
+        print(f"  - Records with {numeric_col} > {threshold}: {len(results)}")
+        
+        # Example 2: String equality filter if string columns exist
+        string_columns = [col for col, res in column_types.items() 
+                        if res['type'] == 'string' and col in df.columns]
+        
+        if string_columns:
+            string_col = string_columns[0]
+            # Find a common value in the string column
+            common_values = df[string_col].mode()
+            
+            if not common_values.empty:
+                common_value = common_values.iat[0]
+                results = memory_storage.query_data(
+                    dataset_name,
+                    filters={string_col: common_value}
+                )
+                print(f"  - Records with {string_col} = '{common_value}': {len(results)}")
+                
+                # Example 3: Combined filter
+                results = memory_storage.query_data(
+                    dataset_name,
+                    filters={
+                        numeric_col: {"gt": threshold},
+                        string_col: common_value
+                    }
+                )
+                print(f"  - Records with {numeric_col} > {threshold} AND {string_col} = '{common_value}': {len(results)}")
+        
+        # Example 4: Aggregation
+        print(f"\n=== Aggregation Examples for {dataset_name} ===")
+        
+        # Group by a string column if available, otherwise use first column
+        group_by_col = string_columns[0] if string_columns else df.columns[0]
+        
+        aggregated = memory_storage.aggregate_data(
+            dataset_name,
+            group_by=[group_by_col],
+            measures={numeric_col: ["sum"]}
+        )
+        
+        print(f"  - Aggregation by {group_by_col}, sum of {numeric_col}:")
+        print(aggregated)
+        
+        # Visualize aggregation results
+        ax = _reset_figure((10, 6))
+        aggregated.plot(kind='bar', x=group_by_col, y=f"{numeric_col}_sum", ax=ax)
+        ax.set_title(f"Sum of {numeric_col} by {group_by_col}")
+        _FIG.tight_layout()
+        _FIG.savefig(str(OUTPUT_DIR / f"{dataset_name}_aggregation.png"))
+        
+        print(f"  - Visualization saved to {dataset_name}_aggregation.png")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,7 +1,11 @@
 import os
 import sys
+from importlib.util import find_spec
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import seaborn as sns
 import numpy as np
 from pathlib import Path
@@ -9,8 +13,18 @@ from pathlib import Path
 # Add the src directory to the path so we can import our modules
 sys.path.append(str(Path(__file__).parent.parent))
 from src.core.data_storage import DataStorage
+from src.core.excel_processor import ExcelProcessor
 from src.core.type_detector import DataTypeDetector
 from src.core.format_parser import FormatParser
+from src.utils.helpers import categorize_string_columns, find_excel_files
+
+# Keep sheet columns Arrow-backed when pyarrow is available
+DTYPE_BACKEND = 'pyarrow' if find_spec('pyarrow') else None
+
+# A single Agg figure reused for every chart, bypassing pyplot's global figure manager
+_FIG = Figure(figsize=(10, 6))
+_CANVAS = FigureCanvasAgg(_FIG)
+_AX = _FIG.add_subplot(111)
 
 
 def main():
@@ -29,12 +43,8 @@ def main():
     file_storage = DataStorage(storage_type='file')
     sqlite_storage = DataStorage(storage_type='sqlite', db_path=str(output_dir / 'financial_data.db'))
     
-    # Find Excel files (avoid duplicates by normalizing paths)
-    excel_files = set()
-    for ext in ['*.xlsx', '*.XLSX']:
-        for file_path in data_dir.glob(ext):
-            excel_files.add(file_path)
-    excel_files = list(excel_files)  # Convert back to list
+    # Find Excel files (single pass, any extension case)
+    excel_files = find_excel_files(data_dir)
     
     if not excel_files:
         print("No Excel files found in the data directory.")
@@ -46,14 +56,17 @@ def main():
     for file_path in excel_files:
         print(f"Processing file: {file_path.name}")
         
-        # Load Excel file
+        # Load Excel file (a single read-only workbook per file)
+        excel_processor = ExcelProcessor()
         try:
-            excel_data = pd.ExcelFile(file_path)
-            for sheet_name in excel_data.sheet_names:
+            if not excel_processor.load_file(str(file_path)):
+                continue
+            
+            for sheet_name in excel_processor.workbooks[str(file_path)].sheetnames:
                 print(f"  Sheet: {sheet_name}")
                 
                 # Extract data
-                df = pd.read_excel(excel_data, sheet_name)
+                df = excel_processor.extract_data(sheet_name, dtype_backend=DTYPE_BACKEND)
                 if df.empty:
                     print(f"  - Empty sheet, skipping")
                     continue
@@ -63,15 +76,16 @@ def main():
                 # Detect column types
                 column_types = {}
                 for column in df.columns:
-                    # Use the analyze_column method directly with the Series
-                    # The DataTypeDetector.analyze_column method expects a pandas Series
-                    detection_result = type_detector.analyze_column(df[column])
-                    column_types[column] = detection_result
+                    column_types[column] = detect_column_type(type_detector, df[column])
+                
+                # Store repeated string values (accounts, currencies, ...) as categoricals
+                df = categorize_string_columns(df, column_types)
                 
                 # Store data in different storage systems
                 dataset_name = f"{file_path.stem}_{sheet_name}"
                 
-                # Store in memory
+                # Store in memory (df is only read from here on, so its buffers may be
+                # shared and frozen; pass copy=True to keep editing it in place)
                 memory_storage.store_data(dataset_name, df, column_types)
                 print(f"  - Stored in memory storage")
                 
@@ -95,47 +109,61 @@ def main():
                 
         except Exception as e:
             print(f"Error processing {file_path.name}: {str(e)}")
+        finally:
+            excel_processor.close()
     
     print("\n=== Storage Processing Complete ===\n")
 
 
+def detect_column_type(type_detector, series):
+    """Detect a column's type, skipping the detector for already-typed numeric/datetime columns."""
+    kind = series.dtype.kind
+    if kind in 'iufM' and series.notna().any():
+        if kind == 'M':
+            return {'type': 'date', 'confidence': 1.0, 'format': 'datetime64'}
+        return {'type': 'number', 'confidence': 1.0, 'format': 'numeric'}
+    
+    # Only object (and other non-numeric) columns need the full analysis
+    # The DataTypeDetector.analyze_column method expects a pandas Series
+    return type_detector.analyze_column(series)
+
+
 def demonstrate_querying(storage, dataset_name, df):
     """Demonstrate various query operations on the dataset."""
     print(f"\n  === Query Examples for {dataset_name} ===")
     
     # Find numeric columns for filtering examples
+    numeric_filter = None
     numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
     if numeric_columns:
         numeric_col = numeric_columns[0]
-        # Get the median value for filtering
+        # Get the median value for filtering (computed once, reused below)
         median_value = df[numeric_col].median()
+        numeric_filter = {f"{numeric_col}__gt": median_value}
         
         # Query for values greater than median
-        query_result = storage.query_by_criteria(dataset_name, {f"{numeric_col}__gt": median_value})
+        query_result = storage.query_by_criteria(dataset_name, numeric_filter)
         print(f"  - Records with {numeric_col} > {median_value:.2f}: {len(query_result)}")
     
     # Find categorical columns for filtering examples
-    categorical_columns = df.select_dtypes(include=['object']).columns.tolist()
+    category_filter = None
+    categorical_columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
     if categorical_columns:
         cat_col = categorical_columns[0]
-        # Get the most common value
-        most_common = df[cat_col].value_counts().index[0] if not df[cat_col].value_counts().empty else None
-        
-        if most_common is not None:
+        # Get the most common value (computed once, reused below)
+        modes = df[cat_col].mode()
+        if not modes.empty:
+            most_common = modes.iat[0]
+            category_filter = {cat_col: most_common}
+            
             # Query for records matching the most common value
-            query_result = storage.query_by_criteria(dataset_name, {cat_col: most_common})
+            query_result = storage.query_by_criteria(dataset_name, category_filter)
             print(f"  - Records with {cat_col} = '{most_common}': {len(query_result)}")
     
-    # Demonstrate multiple criteria
-    if numeric_columns and categorical_columns:
-        numeric_col = numeric_columns[0]
-        cat_col = categorical_columns[0]
-        
+    # Demonstrate multiple criteria, only when both filters above were built
+    if numeric_filter and category_filter:
         # Combined query
-        query_result = storage.query_by_criteria(dataset_name, {
-            f"{numeric_col}__gt": median_value,
-            cat_col: most_common
-        })
+        query_result = storage.query_by_criteria(dataset_name, {**numeric_filter, **category_filter})
         print(f"  - Records with {numeric_col} > {median_value:.2f} AND {cat_col} = '{most_common}': {len(query_result)}")
 
 
@@ -145,7 +173,7 @@ def demonstrate_aggregation(storage, dataset_name, df):
     
     # Find numeric and categorical columns for aggregation examples
     numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_columns = df.select_dtypes(include=['object']).columns.tolist()
+    categorical_columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
     
     if numeric_columns and categorical_columns:
         numeric_col = numeric_columns[0]
@@ -164,16 +192,15 @@ def demonstrate_aggregation(storage, dataset_name, df):
             print(agg_result.sort_values(by=numeric_col, ascending=False).head(5).to_string())
             
             # Create a visualization of the aggregation
-            plt.figure(figsize=(10, 6))
-            sns.barplot(x=cat_col, y=numeric_col, data=agg_result.head(10))
-            plt.title(f"Sum of {numeric_col} by {cat_col}")
-            plt.xticks(rotation=45)
-            plt.tight_layout()
+            _AX.clear()
+            sns.barplot(x=cat_col, y=numeric_col, data=agg_result.head(10), ax=_AX)
+            _AX.set_title(f"Sum of {numeric_col} by {cat_col}")
+            _AX.tick_params(axis='x', labelrotation=45)
+            _FIG.tight_layout()
             
             # Save the visualization
             output_path = Path(__file__).parent.parent / 'output' / f"{dataset_name}_aggregation.png"
-            plt.savefig(output_path)
-            plt.close()
+            _FIG.savefig(output_path)
             print(f"  - Visualization saved to {output_path.name}")
         else:
             print("  - No aggregation results available")
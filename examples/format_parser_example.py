@@ -1,8 +1,9 @@
 import sys
 import os
+from pathlib import Path
 
 # Add the src directory to the path so we can import the modules
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from src.core.format_parser import FormatParser
 
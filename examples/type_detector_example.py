@@ -1,20 +1,47 @@
 import sys
 import os
-import pandas as pd
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib.util import find_spec
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.image as mpimg
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.patches import Patch
 
 # Add the src directory to the path so we can import the modules
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from src.core.excel_processor import ExcelProcessor
 from src.core.type_detector import DataTypeDetector
 
+# Keep sheet columns Arrow-backed when pyarrow is available
+DTYPE_BACKEND = 'pyarrow' if find_spec('pyarrow') else None
+
+# Bar color for each detected type
+TYPE_COLORS = {
+    'string': 'tab:blue',
+    'number': 'tab:orange',
+    'date': 'tab:green',
+    'unknown': 'tab:gray',
+}
+
+# A single Agg figure reused for every chart, bypassing pyplot's global figure manager
+# (bar charts read fine at 80 dpi)
+_FIG = Figure(figsize=(12, 6), dpi=80)
+_CANVAS = FigureCanvasAgg(_FIG)
+_AX = _FIG.add_subplot(111)
+
+# PNG encoding runs in the background while the next chart is drawn
+_PLOT_POOL = ThreadPoolExecutor(max_workers=2)
+
 def main():
     # Initialize the ExcelProcessor and DataTypeDetector
-    excel_processor = ExcelProcessor()
-    type_detector = DataTypeDetector()
+    # Extracted sheets are kept on disk so reruns skip parsing unchanged files
+    sheet_cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'output', '.sheet_cache')
+    excel_processor = ExcelProcessor(cache_dir=sheet_cache_dir)
     
     # Load the sample Excel files
     data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'sample')
@@ -27,39 +54,62 @@ def main():
     
     # Get sheet information
     print("\n=== Available Sheets ===")
+    sheet_infos = {}
     for file_path in excel_processor.files.keys():
-        sheet_info = excel_processor.get_sheet_info(file_path)
+        sheet_info = sheet_infos[file_path] = excel_processor.get_sheet_info(file_path)
         print(f"\nFile: {os.path.basename(file_path)}")
         for sheet_name, info in sheet_info.items():
             print(f"  - {sheet_name}: {info['rows']} rows, {info['columns']} columns")
     
-    # Process each sheet and detect column types
-    print("\n=== Column Type Detection Results ===")
+    # Extract every sheet up front (served from the processor's sheet cache once parsed)
+    sheets = []
     for file_path in excel_processor.files.keys():
+        for sheet_name in sheet_infos[file_path].keys():
+            df = excel_processor.extract_data(sheet_name, file_path, dtype_backend=DTYPE_BACKEND)
+            sheets.append((file_path, sheet_name, df))
+    
+    # Analyze the non-empty sheets in parallel, one worker process per sheet
+    frames = [df for _, _, df in sheets if not df.empty]
+    detections = iter(())
+    if frames:
+        workers = min(len(frames), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            detections = iter(list(executor.map(_analyze_sheet, frames, chunksize=max(1, len(frames) // (workers * 4)))))
+    
+    # Display the results in file and sheet order
+    print("\n=== Column Type Detection Results ===")
+    shown_file = None
+    pending_charts = []
+    for file_path, sheet_name, df in sheets:
         file_name = os.path.basename(file_path)
-        print(f"\nFile: {file_name}")
+        if file_path != shown_file:
+            print(f"\nFile: {file_name}")
+            shown_file = file_path
         
-        sheet_info = excel_processor.get_sheet_info(file_path)
-        for sheet_name in sheet_info.keys():
-            print(f"\n  Sheet: {sheet_name}")
-            
-            # Extract data from the sheet
-            df = excel_processor.extract_data(sheet_name, file_path)
-            
-            if df.empty:
-                print("    No data found in this sheet.")
-                continue
-            
-            # Analyze the DataFrame
-            results = type_detector.analyze_dataframe(df)
-            
-            # Display results
-            print("    Column Type Detection:")
-            for column, result in results.items():
-                print(f"      - {column}: {result['type']} (confidence: {result['confidence']:.2f}, format: {result['format']})")
-            
-            # Visualize the results
-            visualize_results(file_name, sheet_name, results)
+        print(f"\n  Sheet: {sheet_name}")
+        
+        if df.empty:
+            print("    No data found in this sheet.")
+            continue
+        
+        results = next(detections)
+        
+        # Display results
+        print("    Column Type Detection:")
+        for column, result in results.items():
+            print(f"      - {column}: {result['type']} (confidence: {result['confidence']:.2f}, format: {result['format']})")
+        
+        # Visualize the results
+        pending_charts.append(visualize_results(file_name, sheet_name, results))
+    
+    # Wait for the charts to be written
+    for chart in pending_charts:
+        chart.result()
+    _PLOT_POOL.shutdown()
+
+def _analyze_sheet(df):
+    """Detect the column types of one sheet (runs in a worker process)."""
+    return DataTypeDetector().analyze_dataframe(df)
 
 def visualize_results(file_name, sheet_name, results):
     """Create a visualization of the type detection results."""
@@ -67,33 +117,38 @@ def visualize_results(file_name, sheet_name, results):
     columns = list(results.keys())
     types = [result['type'] for result in results.values()]
     confidences = [result['confidence'] for result in results.values()]
-    formats = [result['format'] for result in results.values()]
-    
-    # Create a DataFrame for easier plotting
-    viz_df = pd.DataFrame({
-        'Column': columns,
-        'Type': types,
-        'Confidence': confidences,
-        'Format': formats
-    })
     
-    # Set up the figure
-    plt.figure(figsize=(12, 6))
+    # Reuse the shared figure
+    ax = _AX
+    ax.clear()
     
     # Create a bar plot of confidence scores colored by type
-    ax = sns.barplot(x='Column', y='Confidence', hue='Type', data=viz_df)
+    ax.bar(np.arange(len(columns)), confidences, color=[TYPE_COLORS.get(t, 'tab:gray') for t in types])
+    ax.legend(
+        handles=[Patch(color=TYPE_COLORS.get(t, 'tab:gray'), label=t) for t in dict.fromkeys(types)],
+        title='Type'
+    )
     
     # Customize the plot
-    plt.title(f'Data Type Detection Results - {file_name} - {sheet_name}')
-    plt.xticks(rotation=45, ha='right')
-    plt.ylim(0, 1.0)
-    plt.tight_layout()
+    ax.set_title(f'Data Type Detection Results - {file_name} - {sheet_name}')
+    ax.set_xlabel('Column')
+    ax.set_ylabel('Confidence')
+    ax.set_xticks(np.arange(len(columns)))
+    ax.set_xticklabels([str(column) for column in columns], rotation=45, ha='right')
+    ax.set_ylim(0, 1.0)
+    _FIG.tight_layout()
     
     # Save the figure
     output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'output')
     os.makedirs(output_dir, exist_ok=True)
-    plt.savefig(os.path.join(output_dir, f'{file_name}_{sheet_name}_type_detection.png'))
-    plt.close()
+    # Rasterize now so the figure can be reused, and encode the PNG in the
+    # background with fast zlib compression; returns the Future of the write
+    _CANVAS.draw()
+    rgba = np.array(_CANVAS.buffer_rgba())
+    return _PLOT_POOL.submit(
+        mpimg.imsave, os.path.join(output_dir, f'{file_name}_{sheet_name}_type_detection.png'), rgba,
+        pil_kwargs={'optimize': False, 'compress_level': 1}
+    )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -28,6 +28,9 @@ class DataStorage:
         self.indexes = {}
         self.metadata = {}
         
+        # Parsed CSV datasets of the file backend: path -> (mtime_ns, DataFrame, all columns read)
+        self.file_cache = {}
+        
         # SQLite connection (if applicable)
         self.conn = None
         if storage_type == 'sqlite' and db_path:
@@ -43,6 +46,13 @@ class DataStorage:
             
         cursor = self.conn.cursor()
         
+        # Tune the connection for bulk loads: write-ahead logging with relaxed
+        # syncing avoids an fsync per commit, and temp data stays in memory
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        
         # Create metadata table
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS metadata (
@@ -67,40 +77,109 @@ class DataStorage:
         
         self.conn.commit()
     
-    def store_data(self, name: str, df: pd.DataFrame, column_types: Dict[str, Dict[str, str]]) -> bool:
+    def store_data(self, name: str, df: pd.DataFrame, column_types: Dict[str, Dict[str, str]],
+                   copy: bool = False) -> bool:
         """
         Store a DataFrame with its metadata.
         
+        Unless copy is True, in-memory storage keeps the caller's column data
+        instead of duplicating it, and marks those arrays read-only: the
+        DataFrame may still be used, but its values can no longer be modified
+        in place. Date columns (and other columns without a NumPy buffer to
+        freeze) are copied, so editing them leaves the stored dataset unchanged.
+        
         Args:
             name (str): Name of the dataset
             df (pd.DataFrame): The DataFrame to store
             column_types (Dict): Dictionary of column types from DataTypeDetector
+            copy (bool): Store a private copy of the data (in-memory storage only)
             
         Returns:
             bool: True if successful, False otherwise
         """
+        return self._store(name, df, column_types, self._build_metadata(df, column_types), copy)
+    
+    @staticmethod
+    def store_data_multi(storages: List['DataStorage'], name: str, df: pd.DataFrame,
+                         column_types: Dict[str, Dict[str, str]], copy: bool = False) -> List[bool]:
+        """
+        Store the same DataFrame in several storages in a single pass.
+        
+        The metadata (timestamp, counts and serialized column types) is built
+        once and shared by every storage instead of being recomputed per backend;
+        the column types are only serialized when a SQLite storage needs them.
+        
+        Args:
+            storages (List[DataStorage]): Storages to write the dataset to
+            name (str): Name of the dataset
+            df (pd.DataFrame): The DataFrame to store
+            column_types (Dict): Dictionary of column types from DataTypeDetector
+            copy (bool): Store a private copy of the data (in-memory storage only, see store_data)
+            
+        Returns:
+            List[bool]: Store status for each storage, in the given order
+        """
+        metadata = DataStorage._build_metadata(df, column_types)
+        return [storage._store(name, df, column_types, metadata, copy) for storage in storages]
+    
+    @staticmethod
+    def _build_metadata(df: pd.DataFrame, column_types: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Build the metadata record stored alongside a dataset.
+        """
+        return {
+            'column_types': column_types,
+            'created_at': datetime.now().isoformat(),
+            'row_count': len(df),
+            'column_count': len(df.columns)
+        }
+    
+    def _store(self, name: str, df: pd.DataFrame, column_types: Dict[str, Dict[str, str]],
+               metadata: Dict[str, Any], copy: bool = False) -> bool:
+        """
+        Dispatch a store to the configured backend.
+        """
         if self.storage_type == 'memory':
-            return self._store_in_memory(name, df, column_types)
+            return self._store_in_memory(name, df, column_types, metadata, copy)
         elif self.storage_type == 'sqlite':
-            return self._store_in_sqlite(name, df, column_types)
+            return self._store_in_sqlite(name, df, column_types, metadata)
         elif self.storage_type == 'file':
-            return self._store_in_file(name, df, column_types)
+            return self._store_in_file(name, df, column_types, metadata)
         return False
     
-    def _store_in_memory(self, name: str, df: pd.DataFrame, column_types: Dict[str, Dict[str, str]]) -> bool:
+    def _store_in_memory(self, name: str, df: pd.DataFrame, column_types: Dict[str, Dict[str, str]],
+                         metadata: Dict[str, Any] = None, copy: bool = False) -> bool:
         """
         Store data in memory.
         """
         try:
-            # Store the DataFrame
-            self.data[name] = df.copy()
+            metadata = metadata or self._build_metadata(df, column_types)
+            
+            # Store the DataFrame; without a copy, the frame is shallow-copied so the
+            # caller adding or dropping columns does not change the stored dataset,
+            # and the shared NumPy buffers are frozen against in-place edits
+            if copy:
+                self.data[name] = df.copy()
+            else:
+                stored = df.copy(deep=False)
+                unfrozen = []
+                for block in stored._mgr.blocks:
+                    buffers = self._backing_arrays(block.values)
+                    for buffer in buffers:
+                        buffer.setflags(write=False)
+                    if not buffers:
+                        unfrozen.extend(block.mgr_locs.as_array.tolist())
+                # Columns without a buffer to freeze (e.g. dates) get a private copy instead
+                for position in unfrozen:
+                    stored.isetitem(position, stored.iloc[:, position].copy())
+                self.data[name] = stored
             
             # Store metadata
             self.metadata[name] = {
                 'column_types': column_types,
-                'created_at': datetime.now().isoformat(),
-                'row_count': len(df),
-                'column_count': len(df.columns)
+                'created_at': metadata['created_at'],
+                'row_count': metadata['row_count'],
+                'column_count': metadata['column_count']
             }
             
             # Initialize empty indexes
@@ -116,7 +195,26 @@ class DataStorage:
             print(f"Error storing data in memory: {e}")
             return False
     
-    def _store_in_sqlite(self, name: str, df: pd.DataFrame, column_types: Dict[str, Dict[str, str]]) -> bool:
+    @staticmethod
+    def _backing_arrays(values: Any) -> List[np.ndarray]:
+        """
+        Get the NumPy arrays holding a block's values.
+        
+        Plain blocks are NumPy arrays themselves; categorical and string arrays keep
+        theirs in _ndarray (the codes, for categoricals), and nullable (masked)
+        arrays in _data and _mask. Datetime-like arrays are reported as having none,
+        since pandas does not handle writes to their frozen buffers cleanly, and
+        neither do other extension arrays.
+        """
+        if isinstance(values, np.ndarray):
+            return [values]
+        if isinstance(values, (pd.arrays.DatetimeArray, pd.arrays.TimedeltaArray, pd.arrays.PeriodArray)):
+            return []
+        buffers = [getattr(values, attribute, None) for attribute in ('_ndarray', '_data', '_mask')]
+        return [buffer for buffer in buffers if isinstance(buffer, np.ndarray)]
+    
+    def _store_in_sqlite(self, name: str, df: pd.DataFrame, column_types: Dict[str, Dict[str, str]],
+                         metadata: Dict[str, Any] = None) -> bool:
         """
         Store data in SQLite database.
         """
@@ -125,8 +223,22 @@ class DataStorage:
             return False
             
         try:
+            metadata = metadata or self._build_metadata(df, column_types)
+            
+            # Serialize the column types once per metadata record (shared by store_data_multi)
+            if 'column_types_json' not in metadata:
+                metadata['column_types_json'] = json.dumps(column_types)
+            
             # Create table for the dataset
-            df.to_sql(name, self.conn, if_exists='replace', index=False)
+            columns = self._sqlite_columns(df)
+            if columns is None:
+                df.to_sql(name, self.conn, if_exists='replace', index=False)
+            else:
+                # Same table and values as to_sql, inserted from prebuilt columns in one executemany
+                self.conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+                self.conn.execute(pd.io.sql.get_schema(df, name, con=self.conn))
+                placeholders = ', '.join(['?'] * len(columns))
+                self.conn.executemany(f'INSERT INTO "{name}" VALUES ({placeholders})', zip(*columns))
             
             # Store metadata
             cursor = self.conn.cursor()
@@ -135,10 +247,10 @@ class DataStorage:
             VALUES (?, ?, ?, ?, ?)
             """, (
                 name,
-                json.dumps(column_types),
-                datetime.now().isoformat(),
-                len(df),
-                len(df.columns)
+                metadata['column_types_json'],
+                metadata['created_at'],
+                metadata['row_count'],
+                metadata['column_count']
             ))
             
             self.conn.commit()
@@ -147,29 +259,77 @@ class DataStorage:
             print(f"Error storing data in SQLite: {e}")
             return False
     
-    def _store_in_file(self, name: str, df: pd.DataFrame, column_types: Dict[str, Dict[str, str]]) -> bool:
+    @staticmethod
+    def _sqlite_columns(df: pd.DataFrame) -> Optional[List[list]]:
+        """
+        Convert DataFrame columns to lists of SQLite-ready values, the way to_sql does.
+        
+        Missing values become None and naive datetimes become the ISO text the
+        sqlite3 adapter writes, converted a whole column at a time.
+        
+        Returns:
+            List or None: One list of values per column, or None if a column
+            has a dtype that should go through to_sql (extension, timezone-aware
+            or timedelta dtypes)
+        """
+        if len(df.columns) == 0:
+            return None
+        
+        columns = []
+        for column in range(len(df.columns)):
+            values = df.iloc[:, column]
+            dtype = values.dtype
+            if not isinstance(dtype, np.dtype):
+                return None
+            
+            if dtype.kind == 'M':
+                stamps = values.to_numpy(dtype='datetime64[us]')
+                text = np.char.replace(np.datetime_as_string(stamps, unit='s'), 'T', ' ').astype(object)
+                fractional = stamps.astype('int64') % 1_000_000 != 0
+                if fractional.any():
+                    text[fractional] = np.char.replace(np.datetime_as_string(stamps[fractional], unit='us'), 'T', ' ')
+                text[np.isnat(stamps)] = None
+                columns.append(text.tolist())
+            elif dtype.kind == 'f':
+                floats = values.to_numpy()
+                objects = floats.astype(object)
+                objects[np.isnan(floats)] = None
+                columns.append(objects.tolist())
+            elif dtype.kind in 'iub':
+                columns.append(values.tolist())
+            elif dtype.kind == 'O':
+                columns.append(values.where(values.notna(), None).tolist())
+            else:
+                return None
+        return columns
+    
+    def _store_in_file(self, name: str, df: pd.DataFrame, column_types: Dict[str, Dict[str, str]],
+                       metadata: Dict[str, Any] = None) -> bool:
         """
         Store data in CSV and JSON files.
         """
         try:
+            metadata = metadata or self._build_metadata(df, column_types)
+            
             # Create directory if it doesn't exist
             os.makedirs('data/processed', exist_ok=True)
             
             # Save DataFrame to CSV
             csv_path = f"data/processed/{name}.csv"
             df.to_csv(csv_path, index=False)
+            self.file_cache.pop(csv_path, None)
             
             # Save metadata to JSON
-            metadata = {
+            file_metadata = {
                 'column_types': column_types,
-                'created_at': datetime.now().isoformat(),
-                'row_count': len(df),
-                'column_count': len(df.columns)
+                'created_at': metadata['created_at'],
+                'row_count': metadata['row_count'],
+                'column_count': metadata['column_count']
             }
             
             json_path = f"data/processed/{name}_metadata.json"
             with open(json_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+                json.dump(file_metadata, f, indent=2)
                 
             return True
         except Exception as e:
@@ -216,11 +376,8 @@ class DataStorage:
                 
                 # Create appropriate index based on column type
                 if col_type == 'date':
-                    # Date index: map dates to row indices
-                    date_values = df[column].dropna()
-                    self.indexes[name]['date_index'][column] = {
-                        str(date): idx for idx, date in zip(date_values.index, date_values)
-                    }
+                    # Date index: map dates to the row indices holding them
+                    self.indexes[name]['date_index'][column] = self._rows_by_value(df[column].dropna())
                     
                 elif col_type == 'number':
                     # Amount index: create bins for range queries
@@ -230,25 +387,27 @@ class DataStorage:
                         max_val = amount_values.max()
                         bins = np.linspace(min_val, max_val, 20)  # 20 bins
                         
+                        # Assign every value to its [bin_min, bin_max) bin in one pass;
+                        # the maximum lands past the last bin, as with the half-open ranges
+                        bin_ids = np.digitize(amount_values.to_numpy(dtype='float64'), bins) - 1
+                        labels = amount_values.index.to_numpy()
+                        positions = pd.Series(bin_ids).groupby(bin_ids, sort=False).indices
+                        no_rows = np.array([], dtype=np.intp)
+                        
                         binned_data = {}
                         for i in range(len(bins)-1):
                             bin_min, bin_max = bins[i], bins[i+1]
-                            mask = (amount_values >= bin_min) & (amount_values < bin_max)
-                            binned_data[f"{bin_min:.2f}-{bin_max:.2f}"] = amount_values[mask].index.tolist()
+                            binned_data[f"{bin_min:.2f}-{bin_max:.2f}"] = labels[positions.get(i, no_rows)]
                             
                         self.indexes[name]['amount_index'][column] = binned_data
                         
                 elif col_type == 'string':
                     # Category/text index: map unique values to row indices
                     string_values = df[column].dropna()
-                    unique_values = string_values.unique()
                     
-                    if len(unique_values) < len(string_values) * 0.5:  # If cardinality is low enough
+                    if string_values.nunique() < len(string_values) * 0.5:  # If cardinality is low enough
                         # Categorical index
-                        self.indexes[name]['category_index'][column] = {
-                            str(val): string_values[string_values == val].index.tolist() 
-                            for val in unique_values
-                        }
+                        self.indexes[name]['category_index'][column] = self._rows_by_value(string_values)
                     else:
                         # Text index (simple implementation)
                         text_index = {}
@@ -266,6 +425,23 @@ class DataStorage:
             print(f"Error creating memory indexes: {e}")
             return False
     
+    @staticmethod
+    def _rows_by_value(values: pd.Series) -> Dict[str, np.ndarray]:
+        """
+        Group row indices by value in one pass, keyed by the value as a string.
+        
+        Args:
+            values (pd.Series): Non-null column values
+            
+        Returns:
+            Dict[str, np.ndarray]: Row index labels for each distinct value
+        """
+        labels = values.index.to_numpy()
+        return {
+            str(value): labels[positions]
+            for value, positions in values.groupby(values, sort=False, observed=True).indices.items()
+        }
+    
     def _create_sqlite_indexes(self, name: str, columns: List[str]) -> bool:
         """
         Create SQLite indexes for faster queries.
@@ -286,23 +462,26 @@ class DataStorage:
                 
             column_types = json.loads(result[0])
             
-            for column in columns:
-                # Get column type
-                col_type = 'unknown'
-                if column in column_types:
-                    col_type = column_types[column]['type']
-                
-                # Create SQLite index
-                index_name = f"idx_{name}_{column.replace(' ', '_')}"
-                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {name} ({column})")
+            # Create all indexes and their records in one transaction
+            index_rows = []
+            with self.conn:
+                for column in columns:
+                    # Get column type
+                    col_type = 'unknown'
+                    if column in column_types:
+                        col_type = column_types[column]['type']
+                    
+                    # Create SQLite index
+                    index_name = f"idx_{name}_{column.replace(' ', '_')}"
+                    cursor.execute(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{name}" ("{column}")')
+                    index_rows.append((name, index_name, col_type, column))
                 
-                # Record the index in our indexes table
-                cursor.execute("""
+                # Record the indexes in our indexes table
+                cursor.executemany("""
                 INSERT OR REPLACE INTO indexes (dataset_name, index_name, index_type, column_name)
                 VALUES (?, ?, ?, ?)
-                """, (name, index_name, col_type, column))
+                """, index_rows)
             
-            self.conn.commit()
             return True
         except Exception as e:
             print(f"Error creating SQLite indexes: {e}")
@@ -342,44 +521,70 @@ class DataStorage:
             return pd.DataFrame()
             
         try:
-            df = self.data[name]
-            result_indices = set(range(len(df)))  # Start with all indices
-            
-            for key, value in filters.items():
-                # Check for special operators
-                if '__' in key:
-                    column, operator = key.split('__', 1)
-                    if column not in df.columns:
-                        continue
-                        
-                    # Apply the appropriate filter based on operator
-                    if operator == 'gt':
-                        mask = df[column] > value
-                        result_indices &= set(df[mask].index)
-                    elif operator == 'lt':
-                        mask = df[column] < value
-                        result_indices &= set(df[mask].index)
-                    elif operator == 'between' and isinstance(value, tuple) and len(value) == 2:
-                        mask = (df[column] >= value[0]) & (df[column] <= value[1])
-                        result_indices &= set(df[mask].index)
-                    elif operator == 'in' and isinstance(value, list):
-                        mask = df[column].isin(value)
-                        result_indices &= set(df[mask].index)
-                    elif operator == 'contains' and isinstance(value, str):
-                        mask = df[column].astype(str).str.contains(value, na=False)
-                        result_indices &= set(df[mask].index)
-                else:
-                    # Simple equality filter
-                    if key in df.columns:
-                        mask = df[key] == value
-                        result_indices &= set(df[mask].index)
-            
-            # Return filtered DataFrame
-            return df.loc[list(result_indices)].reset_index(drop=True)
+            return self._filter_rows(self.data[name], filters)
         except Exception as e:
             print(f"Error querying memory data: {e}")
             return pd.DataFrame()
     
+    @staticmethod
+    def _filter_rows(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Select the rows matching all filters as a new DataFrame with a fresh index.
+        
+        Without filters the rows are copied as they are, skipping the all-true
+        mask and the row selection it would drive.
+        """
+        if not filters:
+            return df.reset_index(drop=True)
+        return df[DataStorage._filter_mask(df, filters)].reset_index(drop=True)
+    
+    @staticmethod
+    def _filter_mask(df: pd.DataFrame, filters: Dict[str, Any]) -> np.ndarray:
+        """
+        Evaluate query filters against a DataFrame as a single boolean row mask.
+        
+        Each referenced column is looked up once, and cast to text at most once
+        for 'contains' filters, however many filters use it. Filters on unknown
+        columns or with unsupported operators/values are ignored, and missing
+        values never match.
+        """
+        combined = np.ones(len(df), dtype=bool)
+        columns = {}
+        text_columns = {}
+        
+        for key, value in filters.items():
+            # Check for special operators
+            column, _, operator = key.partition('__')
+            if column not in df.columns:
+                continue
+            
+            if column not in columns:
+                columns[column] = df[column]
+            values = columns[column]
+            
+            # Apply the appropriate filter based on operator
+            if not operator:
+                # Simple equality filter
+                mask = values == value
+            elif operator == 'gt':
+                mask = values > value
+            elif operator == 'lt':
+                mask = values < value
+            elif operator == 'between' and isinstance(value, tuple) and len(value) == 2:
+                mask = (values >= value[0]) & (values <= value[1])
+            elif operator == 'in' and isinstance(value, list):
+                mask = values.isin(value)
+            elif operator == 'contains' and isinstance(value, str):
+                if column not in text_columns:
+                    text_columns[column] = values.astype(str).str
+                mask = text_columns[column].contains(value, na=False, regex=False)
+            else:
+                continue
+            
+            np.logical_and(combined, mask.to_numpy(dtype=bool, na_value=False), out=combined)
+        
+        return combined
+    
     def _query_sqlite(self, name: str, filters: Dict[str, Any]) -> pd.DataFrame:
         """
         Query SQLite data with SQL WHERE clauses.
@@ -442,37 +647,39 @@ class DataStorage:
                 print(f"Dataset file '{csv_path}' not found")
                 return pd.DataFrame()
                 
-            df = pd.read_csv(csv_path)
+            df = self._read_file_dataset(csv_path)
             
-            # Apply filters (similar to in-memory filtering)
-            for key, value in filters.items():
-                # Check for special operators
-                if '__' in key:
-                    column, operator = key.split('__', 1)
-                    if column not in df.columns:
-                        continue
-                        
-                    # Apply the appropriate filter based on operator
-                    if operator == 'gt':
-                        df = df[df[column] > value]
-                    elif operator == 'lt':
-                        df = df[df[column] < value]
-                    elif operator == 'between' and isinstance(value, tuple) and len(value) == 2:
-                        df = df[(df[column] >= value[0]) & (df[column] <= value[1])]
-                    elif operator == 'in' and isinstance(value, list):
-                        df = df[df[column].isin(value)]
-                    elif operator == 'contains' and isinstance(value, str):
-                        df = df[df[column].astype(str).str.contains(value, na=False)]
-                else:
-                    # Simple equality filter
-                    if key in df.columns:
-                        df = df[df[key] == value]
-            
-            return df.reset_index(drop=True)
+            # Apply filters (same as in-memory filtering)
+            return self._filter_rows(df, filters)
         except Exception as e:
             print(f"Error querying file data: {e}")
             return pd.DataFrame()
     
+    def _read_file_dataset(self, csv_path: str, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Read a file-backed dataset, reusing the parsed CSV until the file changes.
+        
+        With columns, only those columns (the ones present in the file) are
+        parsed unless the dataset is already cached. The returned DataFrame is
+        shared between calls and must not be modified.
+        """
+        mtime = os.stat(csv_path).st_mtime_ns
+        cached = self.file_cache.get(csv_path)
+        if cached is not None and cached[0] == mtime:
+            if cached[2] or (columns is not None and all(column in cached[1].columns for column in columns)):
+                return cached[1]
+        
+        if columns is None:
+            df = pd.read_csv(csv_path)
+            self.file_cache[csv_path] = (mtime, df, True)
+            return df
+        
+        wanted = set(columns)
+        header = pd.read_csv(csv_path, nrows=0).columns
+        df = pd.read_csv(csv_path, usecols=[column for column in header if column in wanted])
+        self.file_cache[csv_path] = (mtime, df, False)
+        return df
+    
     def aggregate_data(self, name: str, group_by: List[str], measures: Dict[str, str]) -> pd.DataFrame:
         """
         Aggregate data by grouping and applying aggregate functions.
@@ -518,7 +725,7 @@ class DataStorage:
                 return pd.DataFrame()
             
             # Perform groupby and aggregation
-            grouped = df.groupby(group_by)
+            grouped = df.groupby(group_by, observed=True)
             agg_dict = {col: func for col, func in measures.items()}
             result = grouped.agg(agg_dict).reset_index()
             
@@ -576,7 +783,8 @@ class DataStorage:
                 print(f"Dataset file '{csv_path}' not found")
                 return pd.DataFrame()
                 
-            df = pd.read_csv(csv_path)
+            # Only the grouping and measure columns are needed
+            df = self._read_file_dataset(csv_path, list(group_by) + list(measures.keys()))
             
             # Check if all group_by columns exist
             missing_columns = [col for col in group_by if col not in df.columns]
@@ -650,4 +858,5 @@ class DataStorage:
         """
         if self.storage_type == 'sqlite' and self.conn:
             self.conn.close()
-            self.conn = None
\ No newline at end of file
+            self.conn = None
+        self.file_cache = {}
\ No newline at end of file
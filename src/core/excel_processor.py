@@ -1,7 +1,11 @@
 import pandas as pd
 import openpyxl
 import os
-from typing import Dict, List, Tuple, Union, Any
+import hashlib
+from itertools import islice
+from openpyxl.utils import get_column_letter
+from pandas.io.parsers import TextParser
+from typing import Dict, Iterator, List, Tuple, Union, Any
 
 class ExcelProcessor:
     """
@@ -11,19 +15,38 @@ class ExcelProcessor:
     get sheet information, and preview data using both pandas and openpyxl.
     """
     
-    def __init__(self):
+    def __init__(self, cache_dir: str = None, max_cached_sheets: int = None):
         """
         Initialize the ExcelProcessor with empty data structures.
+        
+        Args:
+            cache_dir: Optional directory for on-disk copies of extracted sheets,
+                reused on later runs while the Excel file is unchanged
+            max_cached_sheets: Optional limit on the number of extracted sheets kept
+                in memory; the least recently used sheet is dropped first
         """
+        self.cache_dir = cache_dir
+        self.max_cached_sheets = max_cached_sheets
         self.files = {}
         self.dataframes = {}
         self.workbooks = {}
         self.current_file = None
+        
+        # Extracted DataFrames keyed by (file_path, sheet_name, dtype_backend)
+        self.sheet_cache = {}
+        
+        # Worksheet dimensions (e.g. 'A1:F120') found while streaming, keyed by (file_path, sheet_name)
+        self.sheet_dimensions = {}
     
     def load_file(self, file_path: str) -> bool:
         """
         Load a single Excel file using both pandas and openpyxl.
         
+        The openpyxl workbook is opened in read-only mode, which streams the
+        sheet XML instead of building every cell object up front, and is shared
+        with the pandas ExcelFile so the file is only opened once. Links to
+        external workbooks are not loaded, since only cached cell values are read.
+        
         Args:
             file_path: Path to the Excel file
             
@@ -35,11 +58,14 @@ class ExcelProcessor:
             return False
         
         try:
-            # Load with pandas
-            self.dataframes[file_path] = pd.ExcelFile(file_path)
+            # Reloading a file drops any sheets extracted from the old copy
+            self._clear_sheet_cache(file_path)
+            
+            # Load with openpyxl (read-only streaming mode)
+            self.workbooks[file_path] = openpyxl.load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
             
-            # Load with openpyxl
-            self.workbooks[file_path] = openpyxl.load_workbook(file_path, data_only=True)
+            # Let pandas reuse the same workbook instead of opening and parsing the file again
+            self.dataframes[file_path] = pd.ExcelFile(self.workbooks[file_path], engine='openpyxl')
             
             # Store file path
             self.files[file_path] = {
@@ -95,28 +121,52 @@ class ExcelProcessor:
         
         # Combine information
         for sheet_name in pd_sheets:
-            # Get pandas dataframe for dimensions
-            df = self.dataframes[file_path].parse(sheet_name)
+            # Read the sheet for its size, reusing an already cached copy; sheets read
+            # here are not added to the cache, so listing a workbook holds no memory
+            df = self.sheet_cache.get((file_path, sheet_name, None))
+            if df is None:
+                df = self._load_cached_sheet(file_path, sheet_name)
+            if df is None:
+                try:
+                    df = self._read_sheet(file_path, sheet_name)
+                except Exception as e:
+                    print(f"Error extracting data from sheet {sheet_name}: {str(e)}")
+                    df = pd.DataFrame()
             
-            # Get openpyxl worksheet
-            ws = self.workbooks[file_path][sheet_name]
+            # The worksheet size is recorded while the sheet is streamed; only
+            # scan the sheet again if it was loaded from the disk cache instead
+            dimensions = self.sheet_dimensions.get((file_path, sheet_name))
+            if dimensions is None:
+                dimensions = self.workbooks[file_path][sheet_name].calculate_dimension(force=True)
             
             sheet_info[sheet_name] = {
                 'rows': len(df),
                 'columns': len(df.columns),
                 'column_names': list(df.columns),
-                'openpyxl_dimensions': ws.dimensions
+                'openpyxl_dimensions': dimensions
             }
         
         return sheet_info
     
-    def extract_data(self, sheet_name: str, file_path: str = None) -> pd.DataFrame:
+    def extract_data(self, sheet_name: str, file_path: str = None, dtype_backend: str = None) -> pd.DataFrame:
         """
         Extract data from a specific sheet as a pandas DataFrame.
         
+        Rows are streamed from the read-only openpyxl worksheet as plain values
+        and converted in a single pass, rather than re-parsing the sheet through
+        pandas' cell-by-cell reader. The first row is used as the header.
+        
+        Extracted sheets are cached, so repeated calls for the same sheet do not
+        parse it again. Each call returns a copy, so the caller may modify it
+        freely without affecting the cache.
+        With a cache_dir, sheets are also kept on disk and reloaded from there
+        until the Excel file is modified.
+        
         Args:
             sheet_name: Name of the sheet to extract data from
             file_path: Path to the Excel file (uses current file if None)
+            dtype_backend: Optional pandas dtype backend for the columns
+                ('numpy_nullable' or 'pyarrow'), as in pd.read_excel
             
         Returns:
             pd.DataFrame: DataFrame containing the sheet data
@@ -126,16 +176,112 @@ class ExcelProcessor:
             print("No file loaded or specified file not found.")
             return pd.DataFrame()
         
+        cache_key = (file_path, sheet_name, dtype_backend)
+        if cache_key in self.sheet_cache:
+            # Move the sheet to the most recently used end
+            df = self.sheet_cache.pop(cache_key)
+            self.sheet_cache[cache_key] = df
+            return df.copy()
+        
+        df = self._load_cached_sheet(file_path, sheet_name, dtype_backend)
+        if df is not None:
+            self._cache_sheet(cache_key, df)
+            return df.copy()
+        
         try:
-            return self.dataframes[file_path].parse(sheet_name)
+            df = self._read_sheet(file_path, sheet_name, dtype_backend)
+            self._cache_sheet(cache_key, df)
+            self._save_cached_sheet(file_path, sheet_name, dtype_backend, df)
+            return df.copy()
         except Exception as e:
             print(f"Error extracting data from sheet {sheet_name}: {str(e)}")
             return pd.DataFrame()
     
+    def _read_sheet(self, file_path: str, sheet_name: str, dtype_backend: str = None) -> pd.DataFrame:
+        """
+        Stream a sheet into a DataFrame, recording its dimensions.
+        
+        Args:
+            file_path: Path to a loaded Excel file
+            sheet_name: Name of the sheet to read
+            dtype_backend: Optional pandas dtype backend for the columns
+            
+        Returns:
+            pd.DataFrame: DataFrame containing the sheet data
+        """
+        ws = self.workbooks[file_path][sheet_name]
+        
+        # Stored dimensions can be missing or wrong in read-only mode
+        ws.reset_dimensions()
+        
+        size = [0, 0]
+        df = self._rows_to_dataframe(self._sized_rows(ws.iter_rows(values_only=True), size), dtype_backend)
+        self.sheet_dimensions[(file_path, sheet_name)] = self._dimension_range(ws, *size)
+        return df
+    
+    @staticmethod
+    def _sized_rows(rows, size: List[int]):
+        """
+        Pass worksheet rows through, recording the sheet size as they go.
+        
+        Matches openpyxl's own dimension scan: the last row holding any cells
+        and the widest row.
+        
+        Args:
+            rows: Iterable of row value tuples, starting at the first row
+            size: Two-item list updated in place with [max_row, max_column]
+        """
+        for row_number, row in enumerate(rows, 1):
+            if row:
+                size[0] = row_number
+                size[1] = max(size[1], len(row))
+            yield row
+    
+    @staticmethod
+    def _dimension_range(ws, max_row: int, max_column: int) -> str:
+        """
+        Format a worksheet size as an openpyxl dimension string such as 'A1:F120'.
+        """
+        if not max_row:
+            return 'A1:A1'
+        return f"{get_column_letter(ws.min_column)}{ws.min_row}:{get_column_letter(max_column)}{max_row}"
+    
+    @staticmethod
+    def _rows_to_dataframe(rows, dtype_backend: str = None) -> pd.DataFrame:
+        """
+        Build a DataFrame from raw worksheet rows, using the first row as header.
+        
+        Uses the same text parser as pandas.read_excel so that missing values,
+        numeric strings and column dtypes come out identically.
+        
+        Args:
+            rows: Iterable of row value tuples
+            dtype_backend: Optional pandas dtype backend for the columns
+            
+        Returns:
+            pd.DataFrame: DataFrame containing the sheet data
+        """
+        data = [list(row) for row in rows]
+        
+        # Drop trailing empty rows, as pandas does
+        while data and all(value is None for value in data[-1]):
+            data.pop()
+        
+        if not data:
+            return pd.DataFrame()
+        
+        if dtype_backend is None:
+            return TextParser(data, header=0).read()
+        return TextParser(data, header=0, dtype_backend=dtype_backend).read()
+    
     def preview_data(self, sheet_name: str = None, rows: int = 5, file_path: str = None) -> pd.DataFrame:
         """
         Preview data from a sheet with a specified number of rows.
         
+        Only the requested rows are read from the workbook (see sample_sheet),
+        unless the sheet has already been extracted, in which case its first
+        rows are returned.
+        
         Args:
             sheet_name: Name of the sheet to preview (uses first sheet if None)
             rows: Number of rows to preview
@@ -153,11 +299,41 @@ class ExcelProcessor:
         if sheet_name is None:
             sheet_name = self.dataframes[file_path].sheet_names[0]
         
+        return self.sample_sheet(sheet_name, file_path, rows)
+    
+    def sample_sheet(self, sheet_name: str, file_path: str = None, rows: int = 512, dtype_backend: str = None) -> pd.DataFrame:
+        """
+        Extract only the first rows of a sheet, e.g. for type detection.
+        
+        Rows are streamed from the read-only worksheet and reading stops after
+        the requested number, so the cost does not grow with the sheet size. If
+        the whole sheet has already been extracted, its first rows are returned
+        instead. Column dtypes are inferred from the sampled rows only.
+        
+        Args:
+            sheet_name: Name of the sheet to sample
+            file_path: Path to the Excel file (uses current file if None)
+            rows: Number of data rows to read (after the header row)
+            dtype_backend: Optional pandas dtype backend for the columns
+            
+        Returns:
+            pd.DataFrame: DataFrame containing at most `rows` rows of the sheet
+        """
+        file_path = file_path or self.current_file
+        if not file_path or file_path not in self.files:
+            print("No file loaded or specified file not found.")
+            return pd.DataFrame()
+        
+        cache_key = (file_path, sheet_name, dtype_backend)
+        if cache_key in self.sheet_cache:
+            return self.sheet_cache[cache_key].head(rows).copy()
+        
         try:
-            df = self.extract_data(sheet_name, file_path)
-            return df.head(rows)
+            ws = self.workbooks[file_path][sheet_name]
+            ws.reset_dimensions()
+            return self._rows_to_dataframe(islice(ws.iter_rows(values_only=True), rows + 1), dtype_backend)
         except Exception as e:
-            print(f"Error previewing data: {str(e)}")
+            print(f"Error sampling sheet {sheet_name}: {str(e)}")
             return pd.DataFrame()
     
     def get_all_sheets_data(self, file_path: str = None) -> Dict[str, pd.DataFrame]:
@@ -175,8 +351,96 @@ class ExcelProcessor:
             print("No file loaded or specified file not found.")
             return {}
         
-        all_data = {}
+        return dict(self.iter_all_sheets_data(file_path))
+    
+    def iter_all_sheets_data(self, file_path: str = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Extract the sheets of the Excel file one at a time.
+        
+        Each sheet is only extracted when the iterator reaches it, so callers
+        that process sheets in turn do not need them all in memory at once when
+        combined with max_cached_sheets.
+        
+        Args:
+            file_path: Path to the Excel file (uses current file if None)
+            
+        Yields:
+            Tuple[str, pd.DataFrame]: Sheet name and the sheet's data, as returned by extract_data
+        """
+        file_path = file_path or self.current_file
+        if not file_path or file_path not in self.files:
+            print("No file loaded or specified file not found.")
+            return
+        
         for sheet_name in self.dataframes[file_path].sheet_names:
-            all_data[sheet_name] = self.extract_data(sheet_name, file_path)
+            yield sheet_name, self.extract_data(sheet_name, file_path)
+    
+    def close(self):
+        """
+        Close all loaded workbooks and clean up resources.
+        
+        Read-only workbooks keep their file open until closed.
+        """
+        for workbook in self.workbooks.values():
+            workbook.close()
         
-        return all_data
\ No newline at end of file
+        self.files = {}
+        self.dataframes = {}
+        self.workbooks = {}
+        self.current_file = None
+        self.sheet_cache = {}
+        self.sheet_dimensions = {}
+    
+    def _cache_sheet(self, cache_key: Tuple[str, str, str], df: pd.DataFrame):
+        """
+        Keep an extracted sheet in memory, dropping the least recently used
+        sheets beyond max_cached_sheets.
+        """
+        self.sheet_cache[cache_key] = df
+        if self.max_cached_sheets is not None:
+            while len(self.sheet_cache) > max(self.max_cached_sheets, 0):
+                del self.sheet_cache[next(iter(self.sheet_cache))]
+    
+    def _clear_sheet_cache(self, file_path: str):
+        """
+        Drop the cached sheets of one file.
+        """
+        for key in [key for key in self.sheet_cache if key[0] == file_path]:
+            del self.sheet_cache[key]
+        for key in [key for key in self.sheet_dimensions if key[0] == file_path]:
+            del self.sheet_dimensions[key]
+    
+    def _disk_cache_path(self, file_path: str, sheet_name: str, dtype_backend: str = None) -> str:
+        """
+        Get the on-disk cache path of an extracted sheet.
+        """
+        key = f"{os.path.abspath(file_path)}\0{sheet_name}\0{dtype_backend}"
+        return os.path.join(self.cache_dir, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.pkl")
+    
+    def _load_cached_sheet(self, file_path: str, sheet_name: str, dtype_backend: str = None) -> pd.DataFrame:
+        """
+        Load an extracted sheet from the disk cache if it is newer than the Excel file.
+        """
+        if not self.cache_dir:
+            return None
+        
+        cache_path = self._disk_cache_path(file_path, sheet_name, dtype_backend)
+        try:
+            if os.path.getmtime(cache_path) < os.path.getmtime(file_path):
+                return None
+            return pd.read_pickle(cache_path)
+        except Exception:
+            return None
+    
+    def _save_cached_sheet(self, file_path: str, sheet_name: str, dtype_backend: str, df: pd.DataFrame):
+        """
+        Write an extracted sheet to the disk cache.
+        """
+        if not self.cache_dir:
+            return
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            df.to_pickle(self._disk_cache_path(file_path, sheet_name, dtype_backend))
+        except Exception as e:
+            print(f"Error caching sheet {sheet_name}: {str(e)}")
\ No newline at end of file
@@ -1,9 +1,40 @@
 import pandas as pd
+import numpy as np
 import re
 import datetime
+import warnings
 from dateutil import parser
 from typing import Dict, List, Union, Any, Tuple
 
+# Patterns used by the per-value parsers, compiled once at import
+_EUROPEAN_DECIMAL_RE = re.compile(r',\d{2}$')
+_INDIAN_SEPARATOR_RE = re.compile(r'[,\s]')
+_QUARTER_RE = re.compile(r'Q([1-4])\s+(\d{4})')
+# Numeric dates with a four-digit year, month and day, optionally followed by a
+# time of day; pandas parses these like dateutil. Dates missing a part are not
+# sent to pandas, which fills the gap with 1 where dateutil uses today's date.
+_FULL_DATE_RE = re.compile(
+    r'(\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{4})'
+    r'([T ]\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?)?$'
+)
+_SPECIAL_FORMAT_RES = {
+    'account_code': re.compile(r'[\s-]'),
+    'reference_number': re.compile(r'[\s]'),
+}
+
+# Excel serial dates count days from December 30, 1899 (absorbing Excel's 1900 leap year bug)
+_EXCEL_EPOCH_ORDINAL = datetime.date(1899, 12, 30).toordinal()
+_EXCEL_EPOCH = np.datetime64('1899-12-30', 'D')
+
+def _is_missing(value: Any) -> bool:
+    """
+    Check a scalar for a missing value, as pd.isna does.
+    
+    Strings, by far the most common input, are never missing, so they skip
+    pd.isna's type dispatch.
+    """
+    return not isinstance(value, str) and pd.isna(value)
+
 class FormatParser:
     """
     A class for parsing and normalizing various financial data formats.
@@ -31,6 +62,10 @@ class FormatParser:
             'C$': 'CAD',  # Canadian Dollar
         }
         
+        # Symbol lookups derived from currency_symbols (see currency_items),
+        # rebuilt whenever the dictionary changes
+        self._currency_source = None
+        
         # Date format patterns
         self.date_formats = {
             'mm/dd/yyyy': r'^(0?[1-9]|1[0-2])/(0?[1-9]|[12]\d|3[01])/\d{4}$',
@@ -42,6 +77,22 @@ class FormatParser:
             'excel_serial': r'^\d{5}$',  # Excel date serial numbers typically 5 digits
         }
         
+        # strptime equivalents of the date formats, for column-level parsing
+        self.strptime_formats = {
+            'mm/dd/yyyy': '%m/%d/%Y',
+            'dd/mm/yyyy': '%d/%m/%Y',
+            'yyyy-mm-dd': '%Y-%m-%d',
+            'dd-mmm-yy': '%d-%b-%y',
+            'mmm-yy': '%b-%y',
+        }
+        
+        # Unambiguous all-numeric formats that per-value parsing tries with strptime
+        # before falling back to dateutil, in the same month-first order dateutil uses
+        self.date_dispatch = tuple(
+            (re.compile(self.date_formats[name]), self.strptime_formats[name])
+            for name in ('mm/dd/yyyy', 'dd/mm/yyyy', 'yyyy-mm-dd')
+        )
+        
         # Abbreviation mappings
         self.abbreviations = {
             'K': 1_000,
@@ -49,6 +100,46 @@ class FormatParser:
             'B': 1_000_000_000,
             'T': 1_000_000_000_000,
         }
+        
+        # Batches at least this large are parsed through the column-level methods
+        self.batch_series_threshold = 10_000
+        
+        # Results of parsing text values, keyed by (value, format hint); ledgers
+        # repeat the same amounts and dates, so each string is parsed only once.
+        # A cache is emptied when it reaches parse_cache_size entries, and when
+        # abbreviations, currency_symbols or date_formats change.
+        self.parse_cache_size = 100_000
+        self._amount_cache = {}
+        self._date_cache = {}
+        self._cache_config = None
+    
+    @property
+    def currency_items(self) -> Tuple[Tuple[str, str], ...]:
+        """
+        (symbol, code) pairs of currency_symbols, longest symbol first so 'A$' wins over '$'.
+        """
+        self._refresh_currency_lookup()
+        return self._currency_items
+    
+    @property
+    def currency_pattern(self) -> re.Pattern:
+        """
+        Single pattern matching any currency symbol, in the order of currency_items.
+        """
+        self._refresh_currency_lookup()
+        return self._currency_pattern
+    
+    def _refresh_currency_lookup(self):
+        """
+        Rebuild the symbol lookups if currency_symbols changed since they were built.
+        """
+        if self._currency_source == self.currency_symbols:
+            return
+        self._currency_source = dict(self.currency_symbols)
+        self._currency_items = tuple(
+            sorted(self._currency_source.items(), key=lambda item: len(item[0]), reverse=True)
+        )
+        self._currency_pattern = re.compile('|'.join(re.escape(symbol) for symbol, _ in self._currency_items))
     
     def parse_amount(self, value: Any, detected_format: str = None) -> float:
         """
@@ -61,7 +152,7 @@ class FormatParser:
         Returns:
             float: The normalized amount as a float
         """
-        if pd.isna(value):
+        if _is_missing(value):
             return None
         
         # Convert to string if not already
@@ -71,6 +162,19 @@ class FormatParser:
                 return float(value)
             value = str(value)
         
+        return self._memoized(self._amount_cache, self._parse_amount_text, value, detected_format)
+    
+    def _parse_amount_text(self, value: str, detected_format: str = None) -> float:
+        """
+        Parse the text of an amount (uncached; see parse_amount).
+        
+        Args:
+            value: The amount string to parse
+            detected_format: Optional format hint
+            
+        Returns:
+            float: The normalized amount as a float, or None
+        """
         # Remove whitespace
         value = value.strip()
         
@@ -78,13 +182,14 @@ class FormatParser:
         if not value:
             return None
         
-        # Extract currency symbol if present
+        # Extract currency symbol if present (one scan rules out the common no-symbol case)
         currency_code = None
-        for symbol, code in self.currency_symbols.items():
-            if symbol in value:
-                currency_code = code
-                value = value.replace(symbol, '')
-                break
+        if self.currency_pattern.search(value):
+            for symbol, code in self.currency_items:
+                if symbol in value:
+                    currency_code = code
+                    value = value.replace(symbol, '')
+                    break
         
         # Handle parentheses for negative values (accounting format)
         is_negative = False
@@ -97,35 +202,36 @@ class FormatParser:
         
         # Handle abbreviations (K, M, B, T)
         multiplier = 1
-        for abbr, mult in self.abbreviations.items():
-            if value.upper().endswith(abbr):
-                multiplier = mult
-                value = value[:-1]  # Remove the abbreviation
-                break
+        abbr = value[-1:].upper()
+        if abbr in self.abbreviations:
+            multiplier = self.abbreviations[abbr]
+            value = value[:-1]  # Remove the abbreviation
         
         # Clean the string for parsing
         # First, determine if it's European format (using comma as decimal separator)
-        if ',' in value and '.' in value:
+        last_comma = value.rfind(',')
+        last_period = value.rfind('.')
+        if last_comma >= 0 and last_period >= 0:
             # If both comma and period exist, determine which is the decimal separator
             # based on position (rightmost is usually the decimal separator)
-            if value.rindex(',') > value.rindex('.'):
+            if last_comma > last_period:
                 # European format: 1.234,56
                 value = value.replace('.', '')
                 value = value.replace(',', '.')
             else:
                 # US format: 1,234.56
                 value = value.replace(',', '')
-        elif ',' in value:
+        elif last_comma >= 0:
             # Could be European decimal or US thousands separator
             # If it's followed by exactly 2 digits at the end, likely European decimal
-            if re.search(r',\d{2}$', value):
+            if _EUROPEAN_DECIMAL_RE.search(value):
                 value = value.replace(',', '.')
             else:
                 value = value.replace(',', '')
         
         # Handle Indian format (e.g., 1,23,456.78)
         if detected_format == 'indian':
-            value = re.sub(r'[,\s]', '', value)
+            value = _INDIAN_SEPARATOR_RE.sub('', value)
         
         # Try to convert to float
         try:
@@ -137,6 +243,75 @@ class FormatParser:
             # If conversion fails, return None
             return None
     
+    def parse_amount_series(self, values: pd.Series, detected_format: str = None) -> pd.Series:
+        """
+        Parse a whole column of financial amounts at once.
+        
+        Numeric columns are converted directly. Otherwise the column is
+        factorized so that each distinct value is parsed only once; columns of
+        plain numeric strings are converted in bulk, anything else (currency
+        symbols, accounting negatives, abbreviations, etc.) goes through
+        parse_amount.
+        
+        Args:
+            values: Pandas Series of amount values to parse
+            detected_format: Optional format hint (e.g., 'us', 'european', 'indian', etc.)
+            
+        Returns:
+            pd.Series: float64 Series of normalized amounts, NaN where parsing failed
+        """
+        # Already numeric columns need no string handling
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            return values.astype('float64')
+        
+        result = np.full(len(values), np.nan)
+        present = values.notna().to_numpy()
+        if not present.any():
+            return pd.Series(result, index=values.index, dtype='float64')
+        
+        # Parse each distinct value only once
+        codes, uniques = pd.factorize(values[present])
+        try:
+            # Plain numeric strings parse the same as float(), so try them in bulk first
+            parsed = self._bulk_parse_amounts(uniques)
+        except (TypeError, ValueError):
+            parsed = np.array(
+                [self.parse_amount(value, detected_format) for value in uniques],
+                dtype='float64'
+            )
+        
+        result[present] = parsed[codes]
+        return pd.Series(result, index=values.index, dtype='float64')
+    
+    @staticmethod
+    def _bulk_parse_amounts(uniques: pd.Index) -> np.ndarray:
+        """
+        Convert plain numeric strings, optionally in accounting parentheses, in one pass.
+        
+        The parentheses are detected with a mask and stripped, and the sign is
+        applied as a -1/1 factor, which matches parse_amount for these values.
+        
+        Args:
+            uniques: Distinct values of the column
+            
+        Returns:
+            np.ndarray: float64 array of parsed amounts
+            
+        Raises:
+            ValueError, TypeError: If any value is not a plain (parenthesized) number
+        """
+        is_negative = np.fromiter(
+            (isinstance(value, str) and value.startswith('(') and value.endswith(')') for value in uniques),
+            dtype=bool, count=len(uniques)
+        )
+        if not is_negative.any():
+            return np.asarray(uniques.astype('float64'))
+        
+        # Only the parenthesized strings are sliced; other values may not be strings at all
+        cores = np.asarray(uniques, dtype=object).copy()
+        cores[is_negative] = [value[1:-1] for value in cores[is_negative]]
+        return cores.astype('float64') * np.where(is_negative, -1.0, 1.0)
+    
     def parse_date(self, value: Any, detected_format: str = None) -> datetime.date:
         """
         Parse a date in various formats and return a normalized datetime.date object.
@@ -148,7 +323,7 @@ class FormatParser:
         Returns:
             datetime.date: The normalized date
         """
-        if pd.isna(value):
+        if _is_missing(value):
             return None
         
         # If it's already a datetime object, convert to date and return
@@ -161,14 +336,23 @@ class FormatParser:
         if not isinstance(value, str):
             # Handle Excel serial date numbers
             if isinstance(value, (int, float)) and 36000 <= value <= 50000:  # Typical Excel date range
-                try:
-                    # Excel dates are number of days since December 30, 1899
-                    # But Excel has a leap year bug, so we use pandas to convert
-                    return pd.to_datetime(value, unit='D', origin='1899-12-30').date()
-                except:
-                    pass
+                # Whole days since the Excel epoch; the fraction is the time of day
+                return datetime.date.fromordinal(_EXCEL_EPOCH_ORDINAL + int(value))
             value = str(value)
         
+        return self._memoized(self._date_cache, self._parse_date_text, value, detected_format)
+    
+    def _parse_date_text(self, value: str, detected_format: str = None) -> datetime.date:
+        """
+        Parse the text of a date (uncached; see parse_date).
+        
+        Args:
+            value: The date string to parse
+            detected_format: Optional format hint
+            
+        Returns:
+            datetime.date: The normalized date, or None
+        """
         # Remove whitespace
         value = value.strip()
         
@@ -177,7 +361,7 @@ class FormatParser:
             return None
         
         # Handle quarter format (e.g., "Q1 2023")
-        quarter_match = re.match(r'Q([1-4])\s+(\d{4})', value)
+        quarter_match = _QUARTER_RE.match(value)
         if quarter_match:
             quarter = int(quarter_match.group(1))
             year = int(quarter_match.group(2))
@@ -185,6 +369,14 @@ class FormatParser:
             month = (quarter - 1) * 3 + 1
             return datetime.date(year, month, 1)
         
+        # Common numeric layouts parse much faster with strptime than with dateutil
+        for pattern, strptime_format in self.date_dispatch:
+            if pattern.match(value):
+                try:
+                    return datetime.datetime.strptime(value, strptime_format).date()
+                except ValueError:
+                    continue
+        
         # Try parsing with dateutil parser
         try:
             return parser.parse(value).date()
@@ -192,6 +384,126 @@ class FormatParser:
             # If parsing fails, return None
             return None
     
+    def _memoized(self, cache: Dict[Tuple[str, str], Any], parse, value: str, detected_format: str = None) -> Any:
+        """
+        Look up a parsed value in a cache, parsing and storing it on a miss.
+        
+        Args:
+            cache: The cache dictionary to use
+            parse: Uncached parse function taking (value, detected_format)
+            value: The string to parse
+            detected_format: Optional format hint
+            
+        Returns:
+            Any: The parsed value
+        """
+        # Results parsed under a different configuration are no longer valid
+        if self._cache_config != (self.abbreviations, self.currency_symbols, self.date_formats):
+            self.clear_parse_cache()
+        
+        key = (value, detected_format)
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        
+        if len(cache) >= self.parse_cache_size:
+            cache.clear()
+        result = cache[key] = parse(value, detected_format)
+        return result
+    
+    def clear_parse_cache(self):
+        """
+        Forget all cached amount and date results.
+        
+        This happens automatically when abbreviations, currency_symbols or
+        date_formats change; call it after changing other parsing settings.
+        """
+        self._amount_cache.clear()
+        self._date_cache.clear()
+        self._cache_config = (dict(self.abbreviations), dict(self.currency_symbols), dict(self.date_formats))
+    
+    def parse_date_series(self, values: pd.Series, detected_format: str = None) -> pd.Series:
+        """
+        Parse a whole column of dates at once with pandas.to_datetime.
+        
+        A format hint that names one of the known date formats (or is itself a
+        strptime format) is parsed with that explicit format; otherwise only
+        complete numeric dates are given to pandas, each read on its own as in
+        batch_parse_dates. Excel serial numbers are converted directly. Values
+        that cannot be parsed this way (e.g. quarters or month names) fall back
+        to parse_date, once per distinct value.
+        
+        Args:
+            values: Pandas Series of date values to parse
+            detected_format: Optional format hint (e.g., 'mm/dd/yyyy', 'excel_serial', '%d-%b-%Y', etc.)
+            
+        Returns:
+            pd.Series: datetime64 Series of normalized dates (time of day dropped), NaT where parsing failed
+        """
+        if pd.api.types.is_datetime64_any_dtype(values):
+            if isinstance(values.dtype, pd.DatetimeTZDtype):
+                values = values.dt.tz_localize(None)
+            return values.dt.normalize()
+        
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            # Excel serial dates, within the same range parse_date accepts
+            # (converting only those, as pandas can overflow on the NaN placeholders)
+            in_range = ((values >= 36000) & (values <= 50000)).fillna(False).astype(bool)
+            parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+            if in_range.any():
+                parsed[in_range] = pd.to_datetime(
+                    values[in_range].astype('float64'), unit='D', origin='1899-12-30'
+                ).to_numpy()
+        elif (inferred := pd.api.types.infer_dtype(values, skipna=True)) in ('string', 'datetime', 'date'):
+            date_format = self.strptime_formats.get(detected_format)
+            if date_format is None and detected_format and '%' in detected_format:
+                date_format = detected_format
+            
+            if date_format is None:
+                # An inferred format would come from the first row and misread
+                # ambiguous days and months further down, so each full numeric date
+                # is read on its own; the rest is left to parse_date
+                if inferred == 'string':
+                    selected = values.str.match(_FULL_DATE_RE, na=False).to_numpy(dtype=bool)
+                else:
+                    selected = values.notna().to_numpy()
+                date_format = 'mixed'
+            else:
+                selected = np.ones(len(values), dtype=bool)
+            
+            with warnings.catch_warnings():
+                # pandas warns about mixed UTC offsets (which newer versions reject outright)
+                warnings.simplefilter('ignore', UserWarning)
+                warnings.simplefilter('ignore', FutureWarning)
+                try:
+                    dates = pd.to_datetime(values[selected], format=date_format, errors='coerce', cache=True)
+                except ValueError:
+                    dates = None
+            if dates is not None and isinstance(dates.dtype, pd.DatetimeTZDtype):
+                # One UTC offset throughout: keep the wall-clock dates, as parse_date does
+                dates = dates.dt.tz_localize(None)
+            
+            parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+            # Mixed UTC offsets give an object Series (or an error); leave them to parse_date
+            if dates is not None and pd.api.types.is_datetime64_dtype(dates):
+                parsed[selected] = dates.to_numpy()
+        else:
+            parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        
+        # Fall back to parse_date for anything pandas could not handle
+        unparsed = parsed.isna() & values.notna()
+        if unparsed.any():
+            codes, uniques = pd.factorize(values[unparsed])
+            fallback = pd.to_datetime(
+                pd.Series([self.parse_date(value, detected_format) for value in uniques], dtype=object),
+                errors='coerce'
+            )
+            parsed = parsed.copy()
+            parsed[unparsed] = fallback.to_numpy()[codes]
+        
+        return parsed.dt.normalize()
+    
     def normalize_currency(self, value: Any, target_currency: str = 'USD', exchange_rates: Dict[str, float] = None) -> Dict[str, Any]:
         """
         Normalize a currency value to a target currency.
@@ -204,7 +516,7 @@ class FormatParser:
         Returns:
             Dict: Dictionary with normalized value and metadata
         """
-        if pd.isna(value):
+        if _is_missing(value):
             return {'value': None, 'currency': None, 'original_value': value}
         
         # Convert to string if not already
@@ -220,15 +532,16 @@ class FormatParser:
         if not value:
             return {'value': None, 'currency': None, 'original_value': value}
         
-        # Extract currency symbol if present
+        # Extract currency symbol if present (one scan rules out the common no-symbol case)
         currency_code = target_currency
         original_value = value
         
-        for symbol, code in self.currency_symbols.items():
-            if symbol in value:
-                currency_code = code
-                value = value.replace(symbol, '')
-                break
+        if self.currency_pattern.search(value):
+            for symbol, code in self.currency_items:
+                if symbol in value:
+                    currency_code = code
+                    value = value.replace(symbol, '')
+                    break
         
         # Parse the amount
         amount = self.parse_amount(value)
@@ -247,6 +560,32 @@ class FormatParser:
             'original_value': original_value
         }
     
+    def normalize_currency_series(self, values: pd.Series, target_currency: str = 'USD', exchange_rates: Dict[str, float] = None) -> pd.DataFrame:
+        """
+        Normalize a whole column of currency values to a target currency.
+        
+        Each distinct value is normalized only once with normalize_currency.
+        
+        Args:
+            values: Pandas Series of currency values to normalize
+            target_currency: The target currency code
+            exchange_rates: Dictionary of exchange rates relative to the target currency
+            
+        Returns:
+            pd.DataFrame: DataFrame with 'value' and 'currency' columns, aligned with the input index
+        """
+        codes, uniques = pd.factorize(values)
+        normalized = [self.normalize_currency(value, target_currency, exchange_rates) for value in uniques]
+        
+        amounts = np.array([n['value'] for n in normalized] + [None], dtype='float64')
+        currencies = np.array([n['currency'] for n in normalized] + [None], dtype=object)
+        
+        # Missing values get code -1, which picks the trailing None entries
+        return pd.DataFrame({
+            'value': amounts[codes],
+            'currency': currencies[codes]
+        }, index=values.index)
+    
     def handle_special_formats(self, value: Any, format_type: str = None) -> Any:
         """
         Handle special formats like codes, abbreviations, etc.
@@ -258,7 +597,7 @@ class FormatParser:
         Returns:
             Parsed and normalized value
         """
-        if pd.isna(value):
+        if _is_missing(value):
             return None
         
         # Convert to string if not already
@@ -275,11 +614,11 @@ class FormatParser:
         # Handle based on format type
         if format_type == 'account_code':
             # Standardize account codes (remove spaces, dashes, etc.)
-            return re.sub(r'[\s-]', '', value).upper()
+            return _SPECIAL_FORMAT_RES['account_code'].sub('', value).upper()
         
         elif format_type == 'reference_number':
             # Standardize reference numbers
-            return re.sub(r'[\s]', '', value)
+            return _SPECIAL_FORMAT_RES['reference_number'].sub('', value)
         
         elif format_type == 'percentage':
             # Handle percentage values
@@ -297,23 +636,77 @@ class FormatParser:
         Parse a list of financial amounts.
         
         Args:
-            values: List of amount values to parse
+            values: List (or array/Series) of amount values to parse
             detected_format: Optional format hint
             
         Returns:
             List[float]: List of normalized amounts
         """
-        return [self.parse_amount(value, detected_format) for value in values]
+        if len(values) < self.batch_series_threshold:
+            return [self.parse_amount(value, detected_format) for value in values]
+        
+        # Large batches: factorized column parsing, with None where parsing failed
+        parsed = self.parse_amount_series(pd.Series(values, dtype=object), detected_format)
+        return [None if np.isnan(value) else value for value in parsed.tolist()]
     
     def batch_parse_dates(self, values: List[Any], detected_format: str = None) -> List[datetime.date]:
         """
         Parse a list of dates.
         
         Args:
-            values: List of date values to parse
+            values: List (or array/Series) of date values to parse
             detected_format: Optional format hint
             
         Returns:
             List[datetime.date]: List of normalized dates
         """
-        return [self.parse_date(value, detected_format) for value in values]
\ No newline at end of file
+        if len(values) < self.batch_series_threshold:
+            return [self.parse_date(value, detected_format) for value in values]
+        
+        # Large batches: parse each distinct value once, None for missing values
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        
+        # Distinct full numeric dates go through one pandas pass (mixed formats); anything
+        # else, such as quarters, month names or non-string values, falls back to parse_date
+        parsed = [None] * len(uniques)
+        
+        # Purely numeric batches are masked with array comparisons instead of per-value checks
+        if pd.api.types.infer_dtype(uniques, skipna=False) in ('integer', 'floating', 'mixed-integer-float'):
+            numbers = np.asarray(uniques, dtype='float64')
+            is_serial = (numbers >= 36000) & (numbers <= 50000)
+            is_text = np.zeros(len(uniques), dtype=bool)
+        else:
+            is_serial = np.fromiter(
+                (isinstance(value, (int, float)) and 36000 <= value <= 50000 for value in uniques),
+                dtype=bool, count=len(uniques)
+            )
+            is_text = np.fromiter(
+                (isinstance(value, str) and _FULL_DATE_RE.match(value) is not None for value in uniques),
+                dtype=bool, count=len(uniques)
+            )
+        
+        # Excel serials are converted with datetime64 day arithmetic, dropping any time of day
+        if is_serial.any():
+            days = np.asarray(uniques[is_serial], dtype='float64').astype('int64')
+            serial_dates = (_EXCEL_EPOCH + days.astype('timedelta64[D]')).tolist()
+            for position, date in zip(np.flatnonzero(is_serial).tolist(), serial_dates):
+                parsed[position] = date
+        
+        if is_text.any():
+            try:
+                with warnings.catch_warnings():
+                    # pandas warns about (and may reject) mixed time zone offsets
+                    warnings.simplefilter('ignore', UserWarning)
+                    warnings.simplefilter('ignore', FutureWarning)
+                    text_dates = pd.to_datetime(uniques[is_text], format='mixed', errors='coerce', cache=True)
+            except (ValueError, TypeError):
+                text_dates = []
+            for position, timestamp in zip(np.flatnonzero(is_text).tolist(), text_dates):
+                if isinstance(timestamp, datetime.datetime) and not pd.isna(timestamp):
+                    parsed[position] = timestamp.date()
+        
+        parsed = [
+            date if date is not None else self.parse_date(value, detected_format)
+            for date, value in zip(parsed, uniques)
+        ]
+        return [parsed[code] if code >= 0 else None for code in codes.tolist()]
\ No newline at end of file
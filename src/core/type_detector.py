@@ -2,7 +2,104 @@ import pandas as pd
 import numpy as np
 import re
 from datetime import datetime
-from typing import Dict, List, Tuple, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
+
+# Patterns used by _determine_number_format, compiled once at import
+_CURRENCY_PREFIX_RE = re.compile(r'^[$€£¥₹]')
+_CURRENCY_CODE_RES = (
+    ('USD', re.compile(r'^\$')),
+    ('EUR', re.compile(r'^€')),
+    ('GBP', re.compile(r'^£')),
+    ('JPY', re.compile(r'^¥')),
+    ('INR', re.compile(r'^₹')),
+)
+_ACCOUNTING_RE = re.compile(r'^\(.+\)$')
+_TRAILING_NEGATIVE_RE = re.compile(r'\d+\.?\d*-$')
+_ABBREVIATED_RE = re.compile(r'[KMB]$')
+_EUROPEAN_RE = re.compile(r'^\d{1,3}(\.\d{3})*(,\d+)$')
+_INDIAN_RE = re.compile(r'^\d{1,2}(,\d{2})*(,\d{3})*(\.\d+)?$')
+
+def _count_matches(pattern: re.Pattern, values: List[str]) -> int:
+    """
+    Count the strings that match a compiled pattern at their start, like Series.str.match.
+    """
+    match = pattern.match
+    return sum(1 for value in values if match(value))
+
+def _best_pattern(patterns: List[str], compiled_patterns: List[re.Pattern], values: List[str]) -> Tuple[int, Optional[str]]:
+    """
+    Find the pattern that matches the most strings, preferring the earliest on ties.
+    
+    A pattern's scan stops as soon as it has missed too many strings to beat the
+    best count so far, and the remaining patterns are skipped once every string
+    has matched.
+    
+    Returns:
+        Tuple: The number of strings matched by the best pattern and the pattern itself,
+        or (0, None) if no pattern matched any string
+    """
+    best_count = 0
+    best_pattern = None
+    for pattern, compiled in zip(patterns, compiled_patterns):
+        allowed_misses = len(values) - best_count
+        if allowed_misses == 0:
+            break
+        
+        match = compiled.match
+        misses = 0
+        for value in values:
+            if not match(value):
+                misses += 1
+                if misses == allowed_misses:
+                    break
+        else:
+            best_count = len(values) - misses
+            best_pattern = pattern
+    return best_count, best_pattern
+
+def _search_rate(pattern: re.Pattern, values: List[str]) -> float:
+    """
+    Fraction of the strings that contain a compiled pattern, like Series.str.contains(...).mean().
+    """
+    if not values:
+        return 0.0
+    search = pattern.search
+    return sum(1 for value in values if search(value)) / len(values)
+
+def _excel_serial_rate(values: pd.Series) -> float:
+    """
+    Fraction of the numeric values that fall in the Excel serial date range used for detection.
+    """
+    array = values.to_numpy(dtype='float64', na_value=np.nan)
+    if len(array) == 0:
+        return 0.0
+    return np.count_nonzero((array >= 36500) & (array <= 50000)) / len(array)
+
+# Cleanup applied by detect_number_format before trying a numeric conversion
+_NUMBER_STRIP_TABLE = str.maketrans('', '', '$€£¥₹,')
+_PARENTHESES_RE = re.compile(r'\((.+)\)')
+_TRAILING_MINUS_RE = re.compile(r'(\d+)-$')
+_SUFFIX_RE = re.compile(r'(\d+\.?\d*)([KMB])$')
+_SUFFIX_MULTIPLIERS = {'K': 1000, 'M': 1000000, 'B': 1000000000}
+
+def _expand_suffix(match: re.Match) -> str:
+    return str(float(match.group(1)) * _SUFFIX_MULTIPLIERS[match.group(2)])
+
+def _clean_number_text(value: str) -> str:
+    """
+    Strip currency symbols and commas, and rewrite parentheses, trailing minus
+    signs and K/M/B abbreviations so the string can be passed to pd.to_numeric.
+    """
+    value = value.translate(_NUMBER_STRIP_TABLE)
+    value = _PARENTHESES_RE.sub(r'-\1', value)
+    value = _TRAILING_MINUS_RE.sub(r'-\1', value)
+    return _SUFFIX_RE.sub(_expand_suffix, value)
+
+def _is_text_dtype(values: pd.Series) -> bool:
+    """
+    Check whether a Series holds text: object, pandas string (python or pyarrow) or categorical.
+    """
+    return pd.api.types.is_string_dtype(values.dtype) or isinstance(values.dtype, pd.CategoricalDtype)
 
 class DataTypeDetector:
     """
@@ -12,10 +109,16 @@ class DataTypeDetector:
     determine their likely data types (string, number, date) with confidence scores.
     """
     
-    def __init__(self):
+    def __init__(self, detect_excel_dates: bool = False):
         """
         Initialize the DataTypeDetector with common patterns for financial data.
+        
+        Args:
+            detect_excel_dates: Whether numeric columns whose values fall in the
+                Excel serial date range should be reported as dates
         """
+        self.detect_excel_dates = detect_excel_dates
+        
         # Patterns for date detection
         self.date_patterns = [
             # MM/DD/YYYY or DD/MM/YYYY
@@ -58,6 +161,12 @@ class DataTypeDetector:
             # Transaction IDs
             r'^[A-Za-z]{2,}\d{4,}$'
         ]
+        
+        # Compiled forms of the patterns above; the pattern strings are what
+        # gets reported as 'format', so both are kept
+        self._date_res = [re.compile(pattern) for pattern in self.date_patterns]
+        self._number_res = [re.compile(pattern) for pattern in self.number_patterns]
+        self._financial_string_res = [re.compile(pattern) for pattern in self.financial_string_patterns]
     
     def analyze_column(self, data: pd.Series) -> Dict[str, Any]:
         """
@@ -79,30 +188,60 @@ class DataTypeDetector:
                 'format': None
             }
         
+        # Columns that already have a datetime or numeric dtype need no pattern probing
+        if pd.api.types.is_datetime64_any_dtype(clean_data):
+            return {
+                'type': 'date',
+                'confidence': 1.0,
+                'format': 'datetime64'
+            }
+        
+        if pd.api.types.is_numeric_dtype(clean_data):
+            if self.detect_excel_dates and _excel_serial_rate(clean_data) > 0.8:
+                return {
+                    'type': 'date',
+                    'confidence': 0.8,
+                    'format': 'excel_serial'
+                }
+            return {
+                'type': 'number',
+                'confidence': 1.0,
+                'format': 'numeric'
+            }
+        
         # Sample data for analysis (up to 100 values)
         sample_size = min(100, len(clean_data))
-        sample_data = clean_data.sample(sample_size) if len(clean_data) > sample_size else clean_data
+        if len(clean_data) > sample_size:
+            # Draw positions directly instead of letting Series.sample permute the whole column
+            positions = np.random.default_rng(0).choice(len(clean_data), size=sample_size, replace=False)
+            sample_data = clean_data.take(positions)
+        else:
+            sample_data = clean_data
+        
+        # Text samples are converted to str once and shared by all checks
+        sample_str = sample_data.astype(str) if _is_text_dtype(sample_data) else None
         
         # Check for date type
-        date_result = self.detect_date_format(sample_data)
+        date_result = self.detect_date_format(sample_data, sample_str)
         if date_result['confidence'] > 0.7:
             return date_result
         
         # Check for number type
-        number_result = self.detect_number_format(sample_data)
+        number_result = self.detect_number_format(sample_data, sample_str)
         if number_result['confidence'] > 0.7:
             return number_result
         
         # If not clearly date or number, classify as string
-        string_result = self.classify_string_type(sample_data)
+        string_result = self.classify_string_type(sample_data, sample_str)
         return string_result
     
-    def detect_date_format(self, sample_values: pd.Series) -> Dict[str, Any]:
+    def detect_date_format(self, sample_values: pd.Series, sample_str: pd.Series = None) -> Dict[str, Any]:
         """
         Detect if the column contains date values and identify the format.
         
         Args:
             sample_values: Sample values from the column
+            sample_str: Optional sample_values.astype(str), if already computed
             
         Returns:
             Dict: Dictionary with type, confidence score, and format information
@@ -124,13 +263,12 @@ class DataTypeDetector:
                 'confidence': 0.9,
                 'format': 'auto-detected'
             }
-        except:
+        except (ValueError, TypeError, OverflowError):
             pass
         
         # Check for Excel serial dates (numeric values around 40000-50000)
         if pd.api.types.is_numeric_dtype(sample_values):
-            excel_date_count = sum((sample_values >= 36500) & (sample_values <= 50000))
-            if excel_date_count / len(sample_values) > 0.8:
+            if _excel_serial_rate(sample_values) > 0.8:
                 return {
                     'type': 'date',
                     'confidence': 0.8,
@@ -138,15 +276,12 @@ class DataTypeDetector:
                 }
         
         # Check against date patterns
-        if sample_values.dtype == 'object':
-            pattern_matches = 0
-            matched_pattern = None
-            
-            for pattern in self.date_patterns:
-                pattern_count = sum(sample_values.astype(str).str.match(pattern, na=False))
-                if pattern_count > pattern_matches:
-                    pattern_matches = pattern_count
-                    matched_pattern = pattern
+        if _is_text_dtype(sample_values):
+            # Match the plain strings directly, without a Series per probe
+            if sample_str is None:
+                sample_str = sample_values.astype(str)
+            sample_list = sample_str.tolist()
+            pattern_matches, matched_pattern = _best_pattern(self.date_patterns, self._date_res, sample_list)
             
             confidence = pattern_matches / len(sample_values)
             if confidence > 0.5:
@@ -162,12 +297,13 @@ class DataTypeDetector:
             'format': None
         }
     
-    def detect_number_format(self, sample_values: pd.Series) -> Dict[str, Any]:
+    def detect_number_format(self, sample_values: pd.Series, sample_str: pd.Series = None) -> Dict[str, Any]:
         """
         Detect if the column contains numeric values and identify the format.
         
         Args:
             sample_values: Sample values from the column
+            sample_str: Optional sample_values.astype(str), if already computed
             
         Returns:
             Dict: Dictionary with type, confidence score, and format information
@@ -181,34 +317,18 @@ class DataTypeDetector:
             }
         
         # For object types, try to identify number patterns
-        if sample_values.dtype == 'object':
-            # Try to convert to numeric after cleaning
-            cleaned_values = sample_values.astype(str).copy()
-            
-            # Remove currency symbols, commas, parentheses
-            cleaned_values = cleaned_values.str.replace(r'[$€£¥₹]', '', regex=True)
-            cleaned_values = cleaned_values.str.replace(r',', '', regex=True)
-            cleaned_values = cleaned_values.str.replace(r'\((.+)\)', r'-\1', regex=True)
-            cleaned_values = cleaned_values.str.replace(r'(\d+)-$', r'-\1', regex=True)
+        if _is_text_dtype(sample_values):
+            if sample_str is None:
+                sample_str = sample_values.astype(str)
             
-            # Handle K, M, B abbreviations
-            cleaned_values = cleaned_values.str.replace(r'(\d+\.?\d*)K$', lambda x: str(float(x.group(1)) * 1000), regex=True)
-            cleaned_values = cleaned_values.str.replace(r'(\d+\.?\d*)M$', lambda x: str(float(x.group(1)) * 1000000), regex=True)
-            cleaned_values = cleaned_values.str.replace(r'(\d+\.?\d*)B$', lambda x: str(float(x.group(1)) * 1000000000), regex=True)
-            
-            # Handle European format (replace comma with dot for decimal)
-            european_format = cleaned_values.str.contains(r'^\d{1,3}(\.\d{3})*(,\d+)$', regex=True)
-            if european_format.sum() > 0:
-                cleaned_values.loc[european_format] = cleaned_values.loc[european_format].str.replace('.', '')
-                cleaned_values.loc[european_format] = cleaned_values.loc[european_format].str.replace(',', '.')
-            
-            # Try to convert to numeric
+            # Clean each string in one Python pass and try to convert to numeric
+            cleaned_values = [_clean_number_text(value) for value in sample_str.tolist()]
             numeric_success = pd.to_numeric(cleaned_values, errors='coerce')
-            success_rate = 1 - (numeric_success.isna().sum() / len(numeric_success))
+            success_rate = 1 - (np.count_nonzero(pd.isna(numeric_success)) / len(numeric_success))
             
             if success_rate > 0.5:
                 # Determine format based on original values
-                format_type = self._determine_number_format(sample_values)
+                format_type = self._determine_number_format(sample_values, sample_str)
                 return {
                     'type': 'number',
                     'confidence': success_rate,
@@ -216,15 +336,9 @@ class DataTypeDetector:
                 }
         
         # Check against number patterns
-        if sample_values.dtype == 'object':
-            pattern_matches = 0
-            matched_pattern = None
-            
-            for pattern in self.number_patterns:
-                pattern_count = sum(sample_values.astype(str).str.match(pattern, na=False))
-                if pattern_count > pattern_matches:
-                    pattern_matches = pattern_count
-                    matched_pattern = pattern
+        if _is_text_dtype(sample_values):
+            sample_list = sample_str.tolist()
+            pattern_matches, matched_pattern = _best_pattern(self.number_patterns, self._number_res, sample_list)
             
             confidence = pattern_matches / len(sample_values)
             if confidence > 0.5:
@@ -240,74 +354,73 @@ class DataTypeDetector:
             'format': None
         }
     
-    def _determine_number_format(self, sample_values: pd.Series) -> str:
+    def _determine_number_format(self, sample_values: pd.Series, sample_str: pd.Series = None) -> str:
         """
         Determine the specific number format used in the sample values.
         
         Args:
             sample_values: Sample values from the column
+            sample_str: Optional sample_values.astype(str), if already computed
             
         Returns:
             str: Detected number format
         """
-        sample_str = sample_values.astype(str)
+        if sample_str is None:
+            sample_str = sample_values.astype(str)
+        sample_list = sample_str.tolist()
         
         # Check for currency symbols
-        if sample_str.str.contains(r'^[$€£¥₹]', regex=True).any():
-            if sample_str.str.contains(r'^\$', regex=True).mean() > 0.5:
-                return 'USD'
-            elif sample_str.str.contains(r'^€', regex=True).mean() > 0.5:
-                return 'EUR'
-            elif sample_str.str.contains(r'^£', regex=True).mean() > 0.5:
-                return 'GBP'
-            elif sample_str.str.contains(r'^¥', regex=True).mean() > 0.5:
-                return 'JPY'
-            elif sample_str.str.contains(r'^₹', regex=True).mean() > 0.5:
-                return 'INR'
+        if any(map(_CURRENCY_PREFIX_RE.search, sample_list)):
+            for currency, pattern in _CURRENCY_CODE_RES:
+                if _search_rate(pattern, sample_list) > 0.5:
+                    return currency
             return 'currency'
         
         # Check for parentheses (negative values)
-        if sample_str.str.contains(r'^\(.+\)$', regex=True).mean() > 0.2:
+        if _search_rate(_ACCOUNTING_RE, sample_list) > 0.2:
             return 'accounting'
         
         # Check for trailing negative
-        if sample_str.str.contains(r'\d+\.?\d*-$', regex=True).mean() > 0.2:
+        if _search_rate(_TRAILING_NEGATIVE_RE, sample_list) > 0.2:
             return 'trailing_negative'
         
         # Check for K, M, B abbreviations
-        if sample_str.str.contains(r'[KMB]$', regex=True).mean() > 0.2:
+        if _search_rate(_ABBREVIATED_RE, sample_list) > 0.2:
             return 'abbreviated'
         
         # Check for European format
-        if sample_str.str.contains(r'^\d{1,3}(\.\d{3})*(,\d+)$', regex=True).mean() > 0.5:
+        if _search_rate(_EUROPEAN_RE, sample_list) > 0.5:
             return 'european'
         
         # Check for Indian format
-        if sample_str.str.contains(r'^\d{1,2}(,\d{2})*(,\d{3})*(\.\d+)?$', regex=True).mean() > 0.5:
+        if _search_rate(_INDIAN_RE, sample_list) > 0.5:
             return 'indian'
         
         # Default to standard
         return 'standard'
     
-    def classify_string_type(self, sample_values: pd.Series) -> Dict[str, Any]:
+    def classify_string_type(self, sample_values: pd.Series, sample_str: pd.Series = None) -> Dict[str, Any]:
         """
         Classify the type of string data in the column.
         
         Args:
             sample_values: Sample values from the column
+            sample_str: Optional sample_values.astype(str), if already computed
             
         Returns:
             Dict: Dictionary with type, confidence score, and format information
         """
         # Convert to string for analysis
-        sample_str = sample_values.astype(str)
+        if sample_str is None:
+            sample_str = sample_values.astype(str)
+        sample_list = sample_str.tolist()
         
         # Check for common financial string patterns
         for pattern_name, pattern in zip(
             ['account_number', 'reference_code', 'transaction_id'],
-            self.financial_string_patterns
+            self._financial_string_res
         ):
-            pattern_match_rate = sample_str.str.match(pattern, na=False).mean()
+            pattern_match_rate = _count_matches(pattern, sample_list) / len(sample_list)
             if pattern_match_rate > 0.7:
                 return {
                     'type': 'string',
@@ -325,7 +438,7 @@ class DataTypeDetector:
             }
         
         # Check average length
-        avg_length = sample_str.str.len().mean()
+        avg_length = sum(map(len, sample_list)) / len(sample_list)
         
         if avg_length > 100:
             # Long text, likely description
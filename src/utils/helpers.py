@@ -1 +1,198 @@
- 
\ No newline at end of file
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def schema_cache_path(file_path: str, sheet_name: str, cache_dir: str) -> str:
+    """
+    Get the path of the cached column types for a sheet.
+
+    Args:
+        file_path: Path to the Excel file
+        sheet_name: Name of the sheet
+        cache_dir: Directory holding the schema cache files
+
+    Returns:
+        str: Path to the JSON cache file for this file and sheet
+    """
+    key = f"{os.path.abspath(os.fspath(file_path))}\0{sheet_name}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(os.fspath(cache_dir), f"{digest}.json")
+
+
+def load_cached_schema(file_path: str, sheet_name: str, cache_dir: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Load previously detected column types for a sheet if the file is unchanged.
+
+    The cache entry is only used when the file's modification time matches the
+    one recorded when the entry was written.
+
+    Args:
+        file_path: Path to the Excel file
+        sheet_name: Name of the sheet
+        cache_dir: Directory holding the schema cache files
+
+    Returns:
+        Dict or None: Column types as returned by DataTypeDetector.analyze_dataframe,
+        or None if there is no valid cache entry
+    """
+    cache_path = schema_cache_path(file_path, sheet_name, cache_dir)
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+
+        if cached.get('mtime_ns') != os.stat(file_path).st_mtime_ns:
+            return None
+
+        # Columns are stored as pairs so non-string column names survive the round trip
+        return {column: result for column, result in cached['column_types']}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_cached_schema(file_path: str, sheet_name: str, cache_dir: str, column_types: Dict[str, Dict[str, Any]]) -> bool:
+    """
+    Save detected column types for a sheet, keyed by file path, mtime and sheet.
+
+    Args:
+        file_path: Path to the Excel file
+        sheet_name: Name of the sheet
+        cache_dir: Directory holding the schema cache files
+        column_types: Column types as returned by DataTypeDetector.analyze_dataframe
+
+    Returns:
+        bool: True if the cache entry was written, False otherwise
+    """
+    cache_path = schema_cache_path(file_path, sheet_name, cache_dir)
+
+    try:
+        payload = json.dumps({
+            'file_path': os.path.abspath(os.fspath(file_path)),
+            'sheet_name': sheet_name,
+            'mtime_ns': os.stat(file_path).st_mtime_ns,
+            'column_types': [[column, result] for column, result in column_types.items()]
+        })
+
+        os.makedirs(os.fspath(cache_dir), exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Error saving schema cache for sheet {sheet_name}: {str(e)}")
+        return False
+
+
+def sample_rows(df: pd.DataFrame, max_rows: int) -> pd.DataFrame:
+    """
+    Take a bounded, deterministic sample of rows from a DataFrame.
+
+    The sample is made of the first and last thirds of the budget plus a
+    random selection from the middle, so formats that only appear at the top
+    or bottom of a sheet (headers, totals) are still represented.
+
+    Args:
+        df: DataFrame to sample
+        max_rows: Maximum number of rows to return
+
+    Returns:
+        pd.DataFrame: The original DataFrame if small enough, otherwise a row sample in original order
+    """
+    n_rows = len(df)
+    if n_rows <= max_rows:
+        return df
+
+    edge = max_rows // 3
+    middle = np.random.default_rng(0).choice(
+        np.arange(edge, n_rows - edge), size=max_rows - 2 * edge, replace=False
+    )
+    positions = np.concatenate([np.arange(edge), np.sort(middle), np.arange(n_rows - edge, n_rows)])
+    return df.iloc[positions]
+
+
+def infer_schema(type_detector, df: pd.DataFrame, max_elements: int = 1_000_000) -> Dict[str, Dict[str, Any]]:
+    """
+    Detect column types on a sample capped at a fixed number of cells.
+
+    Args:
+        type_detector: DataTypeDetector instance
+        df: DataFrame to analyze
+        max_elements: Maximum number of cells to analyze (rows are capped at
+            max_elements // number of columns); pass None to scan the full DataFrame
+
+    Returns:
+        Dict: Dictionary with column names as keys and type information as values
+    """
+    if max_elements is not None and len(df.columns) > 0:
+        df = sample_rows(df, max(1, max_elements // len(df.columns)))
+    return type_detector.analyze_dataframe(df)
+
+
+def categorize_string_columns(df: pd.DataFrame, column_types: Dict[str, Dict[str, Any]],
+                              max_unique_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    Convert low-cardinality string columns to the pandas category dtype.
+
+    Ledger columns such as account, currency or posting group repeat a handful
+    of values across many rows; as categoricals they are stored as integer
+    codes, which uses far less memory and speeds up equality filters and
+    groupby aggregations.
+
+    Args:
+        df: DataFrame to convert
+        column_types: Column types as returned by DataTypeDetector.analyze_dataframe
+        max_unique_ratio: Maximum ratio of unique values to rows for a column to be converted
+
+    Returns:
+        pd.DataFrame: DataFrame with the qualifying string columns converted
+    """
+    n_rows = max(len(df), 1)
+    columns = [
+        column for column, result in column_types.items()
+        if result.get('type') == 'string' and column in df.columns
+        and pd.api.types.is_string_dtype(df[column].dtype) and df[column].nunique() / n_rows < max_unique_ratio
+    ]
+    if not columns:
+        return df
+
+    return df.astype({column: 'category' for column in columns})
+
+
+def is_output_current(output_path: str, source_path: str) -> bool:
+    """
+    Check whether a generated output file is at least as new as its source.
+
+    Args:
+        output_path: Path to the generated file (e.g. a chart image)
+        source_path: Path to the file it was generated from
+
+    Returns:
+        bool: True if the output exists and was modified no earlier than the source
+    """
+    try:
+        return os.path.getmtime(output_path) >= os.path.getmtime(source_path)
+    except OSError:
+        return False
+
+
+def find_excel_files(directory: str) -> List[Path]:
+    """
+    List the Excel files in a directory, matching extensions case-insensitively.
+
+    Args:
+        directory: Directory to search (not recursive)
+
+    Returns:
+        List[Path]: Paths of the .xlsx/.xls files, sorted by name
+    """
+    with os.scandir(directory) as entries:
+        return sorted(
+            Path(entry.path) for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(('.xlsx', '.xls'))
+        )
@@ -85,6 +85,47 @@ class TestDataStorage(unittest.TestCase):
         self.assertEqual(metadata['column_count'], 5)
         self.assertEqual(metadata['column_types'], self.column_types)
     
+    def test_memory_storage_copy(self):
+        """
+        Test that in-memory storage shares read-only data unless asked to copy.
+        """
+        df = self.df.copy()
+        self.memory_storage.store_data('shared', df, self.column_types)
+        with self.assertRaises(ValueError):
+            df.loc[0, 'Amount'] = 0.0
+        
+        # Adding columns to the caller's frame does not change the stored dataset
+        df['Extra'] = 1
+        self.assertNotIn('Extra', self.memory_storage.data['shared'].columns)
+        
+        # Date and categorical columns are not changed through the caller's frame either
+        df = self.df.copy()
+        df['Category'] = df['Category'].astype('category')
+        self.memory_storage.store_data('shared', df, self.column_types)
+        df.loc[0, 'Date'] = pd.Timestamp('2000-01-01')
+        with self.assertRaises(ValueError):
+            df.loc[0, 'Category'] = 'Expense'
+        stored = self.memory_storage.data['shared']
+        self.assertEqual(stored.loc[0, 'Date'], pd.Timestamp('2023-01-01'))
+        self.assertEqual(stored.loc[0, 'Category'], 'Income')
+        
+        df = self.df.copy()
+        self.memory_storage.store_data('copied', df, self.column_types, copy=True)
+        df.loc[0, 'Amount'] = 0.0
+        self.assertEqual(self.memory_storage.data['copied'].loc[0, 'Amount'], 100.50)
+    
+    def test_store_non_string_column_labels(self):
+        """
+        Test that column labels which cannot be serialized to JSON only fail where JSON is needed.
+        """
+        label = pd.Timestamp('2023-01-01')
+        df = pd.DataFrame({label: [1.0, 2.0]})
+        column_types = {label: {'type': 'number', 'format': 'standard', 'confidence': 1.0}}
+        
+        self.assertTrue(self.memory_storage.store_data('dated', df, column_types))
+        self.assertEqual(self.memory_storage.get_metadata('dated')['column_types'], column_types)
+        self.assertFalse(self.sqlite_storage.store_data('dated', df, column_types))
+    
     def test_sqlite_storage(self):
         """
         Test SQLite storage functionality.
@@ -93,6 +134,10 @@ class TestDataStorage(unittest.TestCase):
         result = self.sqlite_storage.store_data('test_data', self.df, self.column_types)
         self.assertTrue(result)
         
+        # Connection is set up for bulk loads
+        journal_mode = self.sqlite_storage.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(journal_mode, 'wal')
+        
         # Check if data was stored correctly by querying it
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -114,6 +159,29 @@ class TestDataStorage(unittest.TestCase):
         
         conn.close()
     
+    def test_sqlite_storage_matches_to_sql(self):
+        """
+        Test that stored tables hold the same schema and values as DataFrame.to_sql.
+        """
+        df = self.df.assign(
+            Date=self.df['Date'].where(self.df['Amount'] > 0) + pd.Timedelta(microseconds=250),
+            Amount=self.df['Amount'].where(self.df['Amount'] > 0),
+            Flag=self.df['Amount'] > 500,
+            Count=np.arange(10),
+            Note=[None, 'x'] * 5
+        )
+        self.sqlite_storage.store_data('test_data', df, self.column_types)
+        df.to_sql('expected', self.sqlite_storage.conn, index=False)
+        
+        conn = self.sqlite_storage.conn
+        schema = conn.execute("SELECT sql FROM sqlite_master WHERE name='test_data'").fetchone()[0]
+        expected_schema = conn.execute("SELECT sql FROM sqlite_master WHERE name='expected'").fetchone()[0]
+        self.assertEqual(schema.replace('"test_data"', '"expected"'), expected_schema)
+        self.assertEqual(
+            conn.execute("SELECT * FROM test_data").fetchall(),
+            conn.execute("SELECT * FROM expected").fetchall()
+        )
+    
     def test_file_storage(self):
         """
         Test file-based storage functionality.
@@ -141,6 +209,31 @@ class TestDataStorage(unittest.TestCase):
         self.assertEqual(metadata['row_count'], 10)
         self.assertEqual(metadata['column_count'], 5)
         self.assertEqual(metadata['column_types'], self.column_types)
+        
+        # Queries reuse the parsed CSV until the dataset is stored again
+        self.assertEqual(len(self.file_storage.query_by_criteria('test_data', {'Amount__gt': 500})), 4)
+        self.assertIn(csv_path, self.file_storage.file_cache)
+        self.file_storage.store_data('test_data', self.df.head(3), self.column_types)
+        self.assertEqual(len(self.file_storage.query_by_criteria('test_data', {})), 3)
+    
+    def test_store_data_multi(self):
+        """
+        Test storing the same dataset in several storages at once.
+        """
+        results = DataStorage.store_data_multi(
+            [self.memory_storage, self.file_storage, self.sqlite_storage],
+            'test_data', self.df, self.column_types
+        )
+        self.assertEqual(results, [True, True, True])
+        
+        # All storages share the same metadata
+        memory_metadata = self.memory_storage.get_metadata('test_data')
+        file_metadata = self.file_storage.get_metadata('test_data')
+        sqlite_metadata = self.sqlite_storage.get_metadata('test_data')
+        self.assertEqual(memory_metadata['created_at'], file_metadata['created_at'])
+        self.assertEqual(memory_metadata['created_at'], sqlite_metadata['created_at'])
+        self.assertEqual(sqlite_metadata['column_types'], self.column_types)
+        self.assertEqual(len(self.file_storage.query_by_criteria('test_data', {})), 10)
     
     def test_create_indexes(self):
         """
@@ -157,6 +250,35 @@ class TestDataStorage(unittest.TestCase):
         self.assertIn('Date', self.memory_storage.indexes['test_data']['date_index'])
         self.assertIn('Amount', self.memory_storage.indexes['test_data']['amount_index'])
         self.assertIn('Category', self.memory_storage.indexes['test_data']['category_index'])
+        
+        # Date index keeps every row holding each date
+        date_index = self.memory_storage.indexes['test_data']['date_index']['Date']
+        self.assertEqual(date_index['2023-01-01 00:00:00'].tolist(), [0])
+        self.assertEqual(len(date_index), 10)
+        
+        category_index = self.memory_storage.indexes['test_data']['category_index']['Category']
+        self.assertEqual(category_index['Expense'].tolist(), [2, 4, 7])
+        self.assertEqual(len(category_index['Income']), 7)
+        
+        # Categorical columns are indexed by their observed values only
+        categorical_df = self.df.astype({'Category': pd.CategoricalDtype(['Income', 'Expense', 'Transfer'])})
+        self.memory_storage.store_data('categorical_data', categorical_df, self.column_types)
+        self.memory_storage.create_indexes('categorical_data', ['Category'])
+        category_index = self.memory_storage.indexes['categorical_data']['category_index']['Category']
+        self.assertEqual(sorted(category_index), ['Expense', 'Income'])
+        self.assertEqual(category_index['Expense'].tolist(), [2, 4, 7])
+        
+        # Amount bins are half-open, so only the maximum falls outside them
+        amount_index = self.memory_storage.indexes['test_data']['amount_index']['Amount']
+        self.assertEqual(len(amount_index), 19)
+        self.assertEqual(sum(len(rows) for rows in amount_index.values()), len(self.df) - 1)
+        
+        # SQLite indexes are created and recorded together, even for sheet names with spaces
+        self.sqlite_storage.store_data('Bank Ledger', self.df, self.column_types)
+        self.assertTrue(self.sqlite_storage.create_indexes('Bank Ledger', ['Date', 'Category']))
+        cursor = self.sqlite_storage.conn.execute(
+            "SELECT index_name, index_type FROM indexes WHERE dataset_name = ? ORDER BY column_name", ('Bank Ledger',))
+        self.assertEqual(cursor.fetchall(), [('idx_Bank Ledger_Category', 'string'), ('idx_Bank Ledger_Date', 'date')])
     
     def test_query_by_criteria(self):
         """
@@ -165,6 +287,12 @@ class TestDataStorage(unittest.TestCase):
         # Store data first
         self.memory_storage.store_data('test_data', self.df, self.column_types)
         
+        # Without filters every row comes back as an independent copy
+        result = self.memory_storage.query_by_criteria('test_data', {})
+        pd.testing.assert_frame_equal(result, self.df)
+        result.loc[0, 'Amount'] = 0.0
+        self.assertEqual(self.memory_storage.data['test_data'].loc[0, 'Amount'], 100.50)
+        
         # Test simple equality filter
         result = self.memory_storage.query_by_criteria('test_data', {'Category': 'Income'})
         self.assertEqual(len(result), 7)  # 7 income records
@@ -189,12 +317,26 @@ class TestDataStorage(unittest.TestCase):
         result = self.memory_storage.query_by_criteria('test_data', {'Description__contains': 'a'})
         self.assertTrue(len(result) > 0)  # At least one description contains 'a'
         
+        # Contains matches the text literally, not as a regular expression
+        result = self.memory_storage.query_by_criteria('test_data', {'Description__contains': '.'})
+        self.assertEqual(len(result), 0)
+        
         # Test multiple filters
         result = self.memory_storage.query_by_criteria('test_data', {
             'Category': 'Income',
             'Amount__gt': 500
         })
         self.assertEqual(len(result), 4)  # 4 income records with Amount > 500
+        
+        # Several filters on the same column, results in stored order
+        filters = {'Amount__gt': 0, 'Amount__lt': 1000, 'Description__contains': 'a'}
+        result = self.memory_storage.query_by_criteria('test_data', filters)
+        self.assertEqual(result['Description'].tolist(), ['Salary', 'Freelance'])
+        
+        # File-based queries use the same filtering
+        self.file_storage.store_data('test_data', self.df, self.column_types)
+        result = self.file_storage.query_by_criteria('test_data', filters)
+        self.assertEqual(result['Description'].tolist(), ['Salary', 'Freelance'])
     
     def test_aggregate_data(self):
         """
@@ -235,6 +377,14 @@ class TestDataStorage(unittest.TestCase):
         # There should be exactly 3 combinations of Category and Account in our test data:
         # (Expense, A002), (Income, A001), (Income, A003)
         self.assertEqual(len(result), 3)  # 3 combinations of Category and Account
+        
+        # File-based aggregation only parses the columns it needs
+        self.file_storage.store_data('test_data', self.df, self.column_types)
+        file_result = self.file_storage.aggregate_data('test_data', group_by=['Category', 'Account'], measures={'Amount': 'sum'})
+        pd.testing.assert_frame_equal(file_result, result)
+        cached = self.file_storage.file_cache['data/processed/test_data.csv'][1]
+        self.assertEqual(list(cached.columns), ['Amount', 'Category', 'Account'])
+        self.assertTrue(self.file_storage.aggregate_data('test_data', group_by=['Missing'], measures={'Amount': 'sum'}).empty)
     
     def test_nonexistent_dataset(self):
         """
@@ -1,8 +1,11 @@
 import unittest
 import os
+import shutil
+import tempfile
 import pandas as pd
 import openpyxl
 from src.core.excel_processor import ExcelProcessor
+from src.core.data_storage import DataStorage
 
 class TestExcelProcessor(unittest.TestCase):
     """
@@ -57,6 +60,10 @@ class TestExcelProcessor(unittest.TestCase):
         # Check that pandas and openpyxl objects were created
         self.assertIsInstance(self.processor.dataframes[self.kh_bank_file], pd.ExcelFile)
         self.assertIsInstance(self.processor.workbooks[self.kh_bank_file], openpyxl.workbook.workbook.Workbook)
+        self.assertTrue(self.processor.workbooks[self.kh_bank_file].read_only)
+        
+        # The pandas ExcelFile wraps the same workbook rather than parsing the file again
+        self.assertIs(self.processor.dataframes[self.kh_bank_file].book, self.processor.workbooks[self.kh_bank_file])
     
     def test_load_file_nonexistent(self):
         """
@@ -111,6 +118,15 @@ class TestExcelProcessor(unittest.TestCase):
             self.assertIsInstance(info['columns'], int)
             self.assertIsInstance(info['column_names'], list)
             self.assertIsInstance(info['openpyxl_dimensions'], str)
+        
+        # Dimensions are recorded while the sheet is streamed, as openpyxl's own scan reports them
+        self.assertEqual(sheet_info['Sheet1']['openpyxl_dimensions'], 'A1:BD1222')
+        self.assertEqual(self.processor.sheet_dimensions[(self.kh_bank_file, 'Sheet1')], 'A1:BD1222')
+        
+        # Listing the sheets does not keep them in the sheet cache
+        self.assertEqual({}, self.processor.sheet_cache)
+        df = self.processor.extract_data('Sheet1')
+        self.assertEqual(self.processor.get_sheet_info()['Sheet1']['rows'], len(df))
     
     def test_get_sheet_info_no_file(self):
         """
@@ -138,6 +154,89 @@ class TestExcelProcessor(unittest.TestCase):
         # Check that the dataframe has the expected structure
         self.assertIsInstance(df, pd.DataFrame)
     
+    def test_extract_data_cached(self):
+        """
+        Test that repeated extraction reuses the cached sheet.
+        """
+        # Load a file first
+        self.processor.load_file(self.kh_bank_file)
+        sheet_name = self.processor.dataframes[self.kh_bank_file].sheet_names[0]
+        
+        df = self.processor.extract_data(sheet_name)
+        self.assertIn((self.kh_bank_file, sheet_name, None), self.processor.sheet_cache)
+        
+        # Adding columns to a returned frame does not leak into the cache
+        df['extra'] = 1
+        again = self.processor.extract_data(sheet_name)
+        self.assertNotIn('extra', again.columns)
+        self.assertTrue(again.equals(df.drop(columns='extra')))
+        
+        # Editing cells in place does not leak into the cache either
+        column = again.columns[0]
+        original = again.loc[0, column]
+        again.loc[0, column] = -999
+        sample = self.processor.sample_sheet(sheet_name, rows=5)
+        sample.loc[1, column] = -999
+        fresh = self.processor.extract_data(sheet_name)
+        self.assertEqual(fresh.loc[0, column], original)
+        self.assertTrue(fresh.equals(df.drop(columns='extra')))
+        
+        # Reloading the file drops its cached sheets
+        self.processor.load_file(self.kh_bank_file)
+        self.assertEqual({}, self.processor.sheet_cache)
+    
+    def test_extract_data_stored_in_memory(self):
+        """
+        Test that storing an extracted sheet in memory storage leaves the cache writable.
+        """
+        self.processor.load_file(self.kh_bank_file)
+        sheet_name = self.processor.dataframes[self.kh_bank_file].sheet_names[0]
+        
+        # Memory storage freezes the buffers of the frame it is given (no copy)
+        storage = DataStorage(storage_type='memory')
+        self.assertTrue(storage.store_data('sheet', self.processor.extract_data(sheet_name), {}))
+        
+        # A later extraction of the same sheet can still be edited in place
+        df = self.processor.extract_data(sheet_name)
+        column = df.columns[0]
+        df.loc[0, column] = -999
+        df.fillna(0, inplace=True)
+        self.assertEqual(df.loc[0, column], -999)
+        self.assertFalse(df.isna().any().any())
+        self.assertNotEqual(storage.data['sheet'].loc[0, column], -999)
+    
+    def test_extract_data_cache_limit(self):
+        """
+        Test that only the most recently used sheets stay cached.
+        """
+        processor = ExcelProcessor(max_cached_sheets=1)
+        processor.load_file(self.kh_bank_file)
+        sheet_name = processor.dataframes[self.kh_bank_file].sheet_names[0]
+        
+        processor.extract_data(sheet_name)
+        processor.extract_data(sheet_name, dtype_backend='numpy_nullable')
+        self.assertEqual([(self.kh_bank_file, sheet_name, 'numpy_nullable')], list(processor.sheet_cache))
+    
+    def test_extract_data_disk_cache(self):
+        """
+        Test that extracted sheets are reloaded from the disk cache.
+        """
+        cache_dir = tempfile.mkdtemp()
+        try:
+            processor = ExcelProcessor(cache_dir=cache_dir)
+            processor.load_file(self.kh_bank_file)
+            sheet_name = processor.dataframes[self.kh_bank_file].sheet_names[0]
+            df = processor.extract_data(sheet_name)
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+            
+            # A new processor reads the sheet back without parsing the workbook
+            processor = ExcelProcessor(cache_dir=cache_dir)
+            processor.load_file(self.kh_bank_file)
+            processor.workbooks[self.kh_bank_file] = None
+            self.assertTrue(processor.extract_data(sheet_name).equals(df))
+        finally:
+            shutil.rmtree(cache_dir)
+    
     def test_extract_data_invalid_sheet(self):
         """
         Test extracting data from an invalid sheet.
@@ -175,6 +274,12 @@ class TestExcelProcessor(unittest.TestCase):
         
         # Check that the dataframe has at most 3 rows
         self.assertLessEqual(len(df), 3)
+        
+        # Previews read only the first rows, without extracting the whole sheet
+        self.assertEqual({}, self.processor.sheet_cache)
+        full = self.processor.extract_data(sheet_names[0])
+        self.assertEqual(list(df.columns), list(full.columns))
+        self.assertEqual(df.isna().values.tolist(), full.head(3).isna().values.tolist())
     
     def test_preview_data_no_sheet(self):
         """
@@ -192,6 +297,24 @@ class TestExcelProcessor(unittest.TestCase):
         # Check that the dataframe has at most 5 rows (default)
         self.assertLessEqual(len(df), 5)
     
+    def test_sample_sheet(self):
+        """
+        Test sampling the first rows of a sheet.
+        """
+        self.processor.load_file(self.customer_ledger_file)
+        sheet_name = self.processor.dataframes[self.customer_ledger_file].sheet_names[0]
+        
+        sample = self.processor.sample_sheet(sheet_name, rows=50)
+        self.assertEqual(50, len(sample))
+        self.assertEqual({}, self.processor.sheet_cache)
+        
+        df = self.processor.extract_data(sheet_name)
+        self.assertEqual(list(df.columns), list(sample.columns))
+        pd.testing.assert_frame_equal(df.head(50), sample, check_dtype=False)
+        self.assertTrue(self.processor.sample_sheet(sheet_name, rows=50).equals(df.head(50)))
+        
+        self.assertTrue(self.processor.sample_sheet('invalid_sheet').empty)
+    
     def test_get_all_sheets_data(self):
         """
         Test getting data from all sheets.
@@ -209,6 +332,22 @@ class TestExcelProcessor(unittest.TestCase):
         for sheet_name, df in all_data.items():
             self.assertIsInstance(df, pd.DataFrame)
     
+    def test_iter_all_sheets_data(self):
+        """
+        Test that sheets are extracted lazily, one per iteration step.
+        """
+        self.processor.load_file(self.customer_ledger_file)
+        
+        sheets = self.processor.iter_all_sheets_data()
+        self.assertEqual({}, self.processor.sheet_cache)
+        
+        items = list(sheets)
+        self.assertEqual(self.processor.dataframes[self.customer_ledger_file].sheet_names, [name for name, _ in items])
+        for sheet_name, df in items:
+            self.assertTrue(df.equals(self.processor.extract_data(sheet_name)))
+        
+        self.assertEqual([], list(ExcelProcessor().iter_all_sheets_data()))
+    
     def test_get_all_sheets_data_no_file(self):
         """
         Test getting all sheets data when no file is loaded.
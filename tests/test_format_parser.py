@@ -117,6 +117,34 @@ class TestFormatParser(unittest.TestCase):
         self.assertIsNone(self.parser.parse_amount(""))
         self.assertIsNone(self.parser.parse_amount("   "))
     
+    def test_parse_cache(self):
+        """
+        Test that repeated text values are parsed once and the cache stays bounded.
+        """
+        self.assertEqual(self.parser.parse_amount("$1,234.56"), 1234.56)
+        self.assertEqual(self.parser.parse_amount("$1,234.56"), 1234.56)
+        self.assertIsNone(self.parser.parse_amount("N/A"))
+        self.assertIsNone(self.parser.parse_amount("N/A"))
+        self.assertEqual(len(self.parser._amount_cache), 2)
+        
+        self.assertEqual(self.parser.parse_date("Q4 2023"), self.parser.parse_date("Q4 2023"))
+        self.assertEqual(len(self.parser._date_cache), 1)
+        
+        self.parser.parse_cache_size = 3
+        for value in ["1", "2", "3", "4"]:
+            self.parser.parse_amount(value)
+        self.assertLessEqual(len(self.parser._amount_cache), 3)
+        self.assertEqual(self.parser.parse_amount("4"), 4.0)
+        
+        # Changing the parsing configuration invalidates cached results
+        self.assertIsNone(self.parser.parse_amount("5L"))
+        self.parser.abbreviations['L'] = 100_000
+        self.assertEqual(self.parser.parse_amount("5L"), 500_000.0)
+        
+        self.parser.clear_parse_cache()
+        self.assertEqual(len(self.parser._amount_cache), 0)
+        self.assertEqual(len(self.parser._date_cache), 0)
+    
     def test_parse_date_standard_formats(self):
         """
         Test parsing standard date formats.
@@ -124,6 +152,12 @@ class TestFormatParser(unittest.TestCase):
         self.assertEqual(self.parser.parse_date("12/31/2023"), datetime.date(2023, 12, 31))
         self.assertEqual(self.parser.parse_date("2023-12-31"), datetime.date(2023, 12, 31))
         self.assertEqual(self.parser.parse_date("January 15, 2023"), datetime.date(2023, 1, 15))
+        
+        # Numeric layouts resolve like dateutil: month first unless that is impossible
+        self.assertEqual(self.parser.parse_date("01/02/2023"), datetime.date(2023, 1, 2))
+        self.assertEqual(self.parser.parse_date("13/02/2023"), datetime.date(2023, 2, 13))
+        self.assertEqual(self.parser.parse_date("2023-2-9"), datetime.date(2023, 2, 9))
+        self.assertIsNone(self.parser.parse_date("02/30/2023"))
     
     def test_parse_date_special_formats(self):
         """
@@ -139,6 +173,10 @@ class TestFormatParser(unittest.TestCase):
         # Excel serial 44927 corresponds to December 31, 2022
         expected_date = pd.to_datetime(44927, unit='D', origin='1899-12-30').date()
         self.assertEqual(self.parser.parse_date(44927), expected_date)
+        
+        # Fractional serials carry a time of day, which is dropped
+        expected_date = pd.to_datetime(44927.99, unit='D', origin='1899-12-30').date()
+        self.assertEqual(self.parser.parse_date(44927.99), expected_date)
     
     def test_parse_date_edge_cases(self):
         """
@@ -152,6 +190,37 @@ class TestFormatParser(unittest.TestCase):
         self.assertIsNone(self.parser.parse_date(""))
         self.assertIsNone(self.parser.parse_date("   "))
     
+    def test_parse_date_series(self):
+        """
+        Test parsing a Series of dates.
+        """
+        # Inferred format, with parse_date fallback for quarters
+        result = self.parser.parse_date_series(pd.Series(["2023-12-31", "Q4 2023", "N/A", None], dtype=object))
+        self.assertEqual(result.iloc[0], pd.Timestamp(2023, 12, 31))
+        self.assertEqual(result.iloc[1], pd.Timestamp(2023, 10, 1))
+        self.assertTrue(pd.isna(result.iloc[2]))
+        self.assertTrue(pd.isna(result.iloc[3]))
+        
+        # Explicit format hint
+        result = self.parser.parse_date_series(pd.Series(["01/02/2023", "31/12/2023"]), detected_format='dd/mm/yyyy')
+        self.assertEqual(result.tolist(), [pd.Timestamp(2023, 2, 1), pd.Timestamp(2023, 12, 31)])
+        
+        # Excel serial dates
+        result = self.parser.parse_date_series(pd.Series([44927]), detected_format='excel_serial')
+        self.assertEqual(result.iloc[0].date(), self.parser.parse_date(44927))
+        
+        # Without a format hint the result matches parse_date, whatever the row order
+        for dates in (["13/02/2023", "01/02/2023"], ["01/02/2023", "13/02/2023"], ["Jan 2023", "2023-01-15", "Q1 2023"]):
+            result = self.parser.parse_date_series(pd.Series(dates), detected_format=r'^\d{1,2}/\d{1,2}/\d{4}$')
+            self.assertEqual([value.date() for value in result], [self.parser.parse_date(v) for v in dates])
+        
+        # UTC offsets, single or mixed, still give naive dates matching parse_date
+        for dates in (["2023-01-15T10:00:00+05:00", "2023-01-16T23:30:00+05:00"],
+                      ["2023-01-15T10:00:00+05:00", "2023-01-16T23:30:00+01:00"]):
+            result = self.parser.parse_date_series(pd.Series(dates))
+            self.assertTrue(pd.api.types.is_datetime64_dtype(result))
+            self.assertEqual([value.date() for value in result], [self.parser.parse_date(v) for v in dates])
+    
     def test_normalize_currency(self):
         """
         Test normalizing currency values.
@@ -173,6 +242,34 @@ class TestFormatParser(unittest.TestCase):
         result = self.parser.normalize_currency("€100", target_currency='USD', exchange_rates=exchange_rates)
         self.assertAlmostEqual(result['value'], 100 / 0.85)
         self.assertEqual(result['currency'], 'EUR')
+        
+        # Multi-character symbols take precedence over the symbols they contain
+        result = self.parser.normalize_currency("A$100")
+        self.assertEqual(result['value'], 100.0)
+        self.assertEqual(result['currency'], 'AUD')
+        
+        # Symbols added to currency_symbols after construction are recognized
+        self.parser.currency_symbols['Fr'] = 'CHF'
+        result = self.parser.normalize_currency("Fr100")
+        self.assertEqual(result['value'], 100.0)
+        self.assertEqual(result['currency'], 'CHF')
+    
+    def test_normalize_currency_series(self):
+        """
+        Test normalizing a Series of currency values.
+        """
+        values = pd.Series(["$1,234.56", "€100", None, "€100"], dtype=object)
+        result = self.parser.normalize_currency_series(values, exchange_rates={'EUR': 0.85})
+        
+        self.assertEqual(list(result.columns), ['value', 'currency'])
+        self.assertEqual(result['value'].iloc[0], 1234.56)
+        self.assertAlmostEqual(result['value'].iloc[1], 100 / 0.85)
+        self.assertTrue(np.isnan(result['value'].iloc[2]))
+        self.assertEqual(result['currency'].tolist(), ['USD', 'EUR', None, 'EUR'])
+        
+        # Any currency symbol is detected by the combined pattern
+        self.assertTrue(values.astype(str).str.contains(self.parser.currency_pattern).any())
+        self.assertIsNone(self.parser.currency_pattern.search("1,234.56"))
     
     def test_handle_special_formats(self):
         """
@@ -197,6 +294,44 @@ class TestFormatParser(unittest.TestCase):
         amounts = ["$100", "€200", "300"]
         expected = [100.0, 200.0, 300.0]
         self.assertEqual(self.parser.batch_parse_amounts(amounts), expected)
+        
+        # Large batches go through parse_amount_series but return the same values
+        amounts = self.test_amounts * (self.parser.batch_series_threshold // len(self.test_amounts) + 1)
+        self.assertEqual(self.parser.batch_parse_amounts(amounts), [self.parser.parse_amount(v) for v in amounts])
+    
+    def test_parse_amount_series(self):
+        """
+        Test parsing a Series of amounts matches parse_amount.
+        """
+        values = pd.Series(self.test_amounts, dtype=object)
+        result = self.parser.parse_amount_series(values)
+        
+        self.assertEqual(result.dtype, np.float64)
+        for value, parsed in zip(self.test_amounts, result):
+            expected = self.parser.parse_amount(value)
+            if expected is None:
+                self.assertTrue(np.isnan(parsed))
+            else:
+                self.assertEqual(parsed, expected)
+        
+        # Numeric and plain numeric string columns
+        pd.testing.assert_series_equal(
+            self.parser.parse_amount_series(pd.Series([1, 2, 3])),
+            pd.Series([1.0, 2.0, 3.0])
+        )
+        self.assertEqual(self.parser.parse_amount_series(pd.Series(["1.5", "2", "1.5"])).tolist(), [1.5, 2.0, 1.5])
+        
+        # Accounting negatives of plain numbers
+        values = ["(2500.00)", "12.5", "(-3)", "(2500.00)"]
+        self.assertEqual(self.parser.parse_amount_series(pd.Series(values)).tolist(), [self.parser.parse_amount(v) for v in values])
+        
+        # Object columns without any strings
+        values = pd.Series([datetime.date(2023, 1, 1), datetime.date(2023, 1, 2)], dtype=object)
+        self.assertTrue(self.parser.parse_amount_series(values).isna().all())
+        
+        # Parenthesized strings next to non-string numbers
+        values = pd.Series(["(100)", np.float64(12.5), "(100)"], dtype=object)
+        self.assertEqual(self.parser.parse_amount_series(values).tolist(), [-100.0, 12.5, -100.0])
     
     def test_batch_parse_dates(self):
         """
@@ -209,6 +344,25 @@ class TestFormatParser(unittest.TestCase):
             datetime.date(2023, 1, 1)
         ]
         self.assertEqual(self.parser.batch_parse_dates(dates), expected)
+        
+        # Large batches parse each distinct value once but return the same values
+        dates = self.test_dates * (self.parser.batch_series_threshold // len(self.test_dates) + 1)
+        self.assertEqual(self.parser.batch_parse_dates(dates), [self.parser.parse_date(v) for v in dates])
+        self.assertEqual(self.parser.batch_parse_dates(pd.Series(dates)), self.parser.batch_parse_dates(dates))
+        
+        # Many distinct dates in mixed formats
+        days = pd.date_range('2020-01-01', periods=self.parser.batch_series_threshold // 2)
+        dates = list(days.strftime('%m/%d/%Y')) + list(days.strftime('%Y-%m-%d')) + ["Q4 2023", "Dec-23", 44927]
+        dates += ["2023", "Jan 2023", "13/02/2023", "2023-01-15 10:30:00", "2023-01-15T23:30:00+05:00"]
+        self.assertEqual(self.parser.batch_parse_dates(dates), [self.parser.parse_date(v) for v in dates])
+        
+        # Excel serials, with and without a time of day, next to out-of-range numbers
+        serials = [44927 + i / 4 for i in range(self.parser.batch_series_threshold)] + [44927, 12, True, 60000.5]
+        self.assertEqual(self.parser.batch_parse_dates(serials), [self.parser.parse_date(v) for v in serials])
+        
+        # A purely numeric batch, with missing values
+        serials = serials[:-2] + [np.nan, 36000, 50000.5]
+        self.assertEqual(self.parser.batch_parse_dates(serials), [self.parser.parse_date(v) for v in serials])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,142 @@
+import unittest
+import os
+import tempfile
+import shutil
+import pandas as pd
+from src.core.type_detector import DataTypeDetector
+from src.utils.helpers import schema_cache_path, load_cached_schema, save_cached_schema, sample_rows, infer_schema, categorize_string_columns, is_output_current, find_excel_files
+
+class TestSchemaCache(unittest.TestCase):
+    """
+    Test cases for the schema cache helpers.
+    """
+    
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+        self.file_path = os.path.join(self.temp_dir, 'book.xlsx')
+        with open(self.file_path, 'wb') as f:
+            f.write(b'test')
+        
+        self.column_types = {
+            'Date': {'type': 'date', 'confidence': 1.0, 'format': 'datetime64'},
+            2023: {'type': 'number', 'confidence': 0.9, 'format': 'standard'}
+        }
+    
+    def tearDown(self):
+        """
+        Clean up test fixtures.
+        """
+        shutil.rmtree(self.temp_dir)
+    
+    def test_cache_path_per_sheet(self):
+        """
+        Test that each sheet gets its own cache file.
+        """
+        path1 = schema_cache_path(self.file_path, 'Sheet1', self.cache_dir)
+        path2 = schema_cache_path(self.file_path, 'Sheet2', self.cache_dir)
+        self.assertNotEqual(path1, path2)
+        self.assertEqual(os.path.dirname(path1), self.cache_dir)
+    
+    def test_round_trip(self):
+        """
+        Test saving and loading column types.
+        """
+        self.assertIsNone(load_cached_schema(self.file_path, 'Sheet1', self.cache_dir))
+        self.assertTrue(save_cached_schema(self.file_path, 'Sheet1', self.cache_dir, self.column_types))
+        self.assertEqual(load_cached_schema(self.file_path, 'Sheet1', self.cache_dir), self.column_types)
+        self.assertIsNone(load_cached_schema(self.file_path, 'Sheet2', self.cache_dir))
+    
+    def test_invalidated_on_modification(self):
+        """
+        Test that a cache entry is ignored once the file changes.
+        """
+        save_cached_schema(self.file_path, 'Sheet1', self.cache_dir, self.column_types)
+        stat = os.stat(self.file_path)
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(load_cached_schema(self.file_path, 'Sheet1', self.cache_dir))
+    
+    def test_output_current(self):
+        """
+        Test the output freshness check against the source file.
+        """
+        output_path = os.path.join(self.temp_dir, 'chart.png')
+        self.assertFalse(is_output_current(output_path, self.file_path))
+        
+        with open(output_path, 'wb') as f:
+            f.write(b'png')
+        stat = os.stat(self.file_path)
+        os.utime(output_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertTrue(is_output_current(output_path, self.file_path))
+        
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertFalse(is_output_current(output_path, self.file_path))
+    
+    def test_find_excel_files(self):
+        """
+        Test that Excel files are found regardless of extension case.
+        """
+        for name in ['Bank.XLSX', 'old.xls', 'notes.txt']:
+            with open(os.path.join(self.temp_dir, name), 'wb') as f:
+                f.write(b'test')
+        os.makedirs(os.path.join(self.temp_dir, 'folder.xlsx'))
+        
+        found = [path.name for path in find_excel_files(self.temp_dir)]
+        self.assertEqual(found, ['Bank.XLSX', 'book.xlsx', 'old.xls'])
+
+class TestSchemaSampling(unittest.TestCase):
+    """
+    Test cases for sample-based schema inference.
+    """
+    
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.df = pd.DataFrame({
+            'Amount': [float(i) for i in range(1000)],
+            'Account': [f'ACC{i:05d}' for i in range(1000)]
+        })
+    
+    def test_sample_rows(self):
+        """
+        Test that samples are bounded, ordered and keep the first and last rows.
+        """
+        sample = sample_rows(self.df, 90)
+        self.assertEqual(len(sample), 90)
+        self.assertTrue(sample.index.is_monotonic_increasing)
+        self.assertEqual(sample.index[0], 0)
+        self.assertEqual(sample.index[-1], 999)
+        self.assertTrue(sample.equals(sample_rows(self.df, 90)))
+        self.assertIs(sample_rows(self.df, 5000), self.df)
+    
+    def test_infer_schema(self):
+        """
+        Test that sampled inference returns a result for every column.
+        """
+        results = infer_schema(DataTypeDetector(), self.df, max_elements=200)
+        self.assertEqual(set(results.keys()), {'Amount', 'Account'})
+        self.assertEqual(results['Account']['type'], 'string')
+    
+    def test_categorize_string_columns(self):
+        """
+        Test that only low-cardinality string columns become categoricals.
+        """
+        df = self.df.assign(Currency=['USD', 'EUR'] * 500)
+        column_types = {
+            'Amount': {'type': 'number'},
+            'Account': {'type': 'string'},
+            'Currency': {'type': 'string'}
+        }
+        result = categorize_string_columns(df, column_types)
+        self.assertIsInstance(result['Currency'].dtype, pd.CategoricalDtype)
+        self.assertEqual(result['Account'].dtype, object)
+        self.assertEqual(result['Amount'].dtype, df['Amount'].dtype)
+        self.assertEqual(result['Currency'].tolist(), df['Currency'].tolist())
+        self.assertIs(categorize_string_columns(self.df, {'Amount': {'type': 'number'}}), self.df)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -220,6 +220,20 @@ class TestDataTypeDetector(unittest.TestCase):
         self.assertEqual(result['type'], 'string')
         self.assertGreater(result['confidence'], 0.5)
         
+        # Test already-typed columns
+        result = self.detector.analyze_column(pd.Series([1000.0, 1500.5, np.nan]))
+        self.assertEqual(result, {'type': 'number', 'confidence': 1.0, 'format': 'numeric'})
+        result = self.detector.analyze_column(self.excel_date_data)
+        self.assertEqual(result['format'], 'numeric')
+        result = DataTypeDetector(detect_excel_dates=True).analyze_column(self.excel_date_data)
+        self.assertEqual(result['format'], 'excel_serial')
+        result = self.detector.analyze_column(pd.to_datetime(self.iso_date_data))
+        self.assertEqual(result['format'], 'datetime64')
+        
+        # Test that long columns are sampled reproducibly
+        long_data = pd.concat([self.reference_code_data, self.description_data] * 20, ignore_index=True)
+        self.assertEqual(self.detector.analyze_column(long_data), self.detector.analyze_column(long_data))
+        
         # Test mixed column with nulls
         result = self.detector.analyze_column(self.mixed_data)
         self.assertIn(result['type'], ['date', 'number', 'string'])